@@ -0,0 +1,22 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-lms-streaks")
+@click.option("--member", help="Rebuild the streak of a single member")
+@pass_context
+def rebuild_lms_streaks(context, member=None):
+	"""Rebuild the learning streaks of members from their daily activity"""
+	from lms.lms.doctype.lms_streak.lms_streak import rebuild_streaks
+
+	frappe.init(site=get_site(context))
+	frappe.connect()
+	try:
+		rebuild_streaks(member)
+		frappe.db.commit()
+	finally:
+		frappe.destroy()
+
+
+commands = [rebuild_lms_streaks]
@@ -73,6 +73,9 @@ doc_events = {
 scheduler_events = {
     "all": [
         "lms.sqlite.build_index_in_background",
+        "lms.lms.doctype.course_lesson.course_lesson.flush_scorm_progress",
+        "lms.lms.utils.send_progress_events",
+        "lms.lms.doctype.lms_seat_hold.lms_seat_hold.expire_seat_holds",
     ],
     "hourly": [
         "lms.lms.doctype.lms_certificate_request.lms_certificate_request.schedule_evals",
@@ -85,9 +88,15 @@ scheduler_events = {
         "lms.lms.doctype.lms_payment.lms_payment.send_payment_reminder",
         "lms.lms.doctype.lms_batch.lms_batch.send_batch_start_reminder",
         "lms.lms.doctype.lms_live_class.lms_live_class.send_live_class_reminder",
+        "lms.lms.doctype.lms_daily_activity.lms_daily_activity.rebuild_recent_daily_activity",
     ],
 }
 
+# Reminder logs are only needed to skip the recipients of a retried job
+default_log_clearing_doctypes = {
+    "LMS Reminder Log": 90,
+}
+
 # Fixtures
 fixtures = [
     "Custom Field", 
@@ -232,6 +241,11 @@ lms_markdown_macro_renderers = {
     "PDF": "lms.plugins.pdf_renderer",
 }
 
+# Bulk data loaders for the macros of a lesson, see lms.lms.md
+lms_markdown_macro_prefetchers = {
+    "Quiz": "lms.plugins.prefetch_quizzes",
+}
+
 # Page Renderers
 page_renderer = [
     "lms.page_renderers.SCORMRenderer",
@@ -8,7 +8,6 @@ import shutil
 import sys
 import xml.etree.ElementTree as ET
 import zipfile
-from datetime import timedelta
 from pathlib import Path
 from xml.dom.minidom import parseString
 
@@ -19,6 +18,7 @@ from frappe.integrations.frappe_providers.frappecloud_billing import (
 	is_fc_site,
 )
 from frappe.query_builder import DocType
+from frappe.query_builder.functions import Avg, Count
 from frappe.translate import get_all_translations
 from frappe.utils import (
 	add_days,
@@ -30,10 +30,24 @@ from frappe.utils import (
 	getdate,
 	now,
 )
+from frappe.utils.caching import redis_cache
 from frappe.utils.response import Response
 
 from lms.lms.doctype.course_lesson.course_lesson import save_progress
-from lms.lms.utils import get_average_rating, get_batch_details, get_course_details, get_lesson_count
+from lms.lms.doctype.lms_enrollment.lms_enrollment import enqueue_course_progress_update
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import has_available_seat
+from lms.lms.doctype.lms_streak.lms_streak import calculate_current_streak
+from lms.lms.utils import (
+	clear_batch_details_cache,
+	clear_course_outline_cache,
+	get_batch_details,
+	get_course_cards,
+	get_course_details,
+	get_lesson_at,
+	get_out_of_ratings,
+	refresh_course_lesson_count,
+	update_course_counter,
+)
 from lms.lms.doctype.batch_grade_sheet.batch_grade_sheet import ensure_batch_permission
 
 # Allow imports like ``lms.lms.api.attendance`` even though this file is a module.
@@ -133,9 +147,7 @@ def verify_billing_access(doctype, name, billing_type):
 			access = False
 			message = _("You are already enrolled for this batch.")
 
-		seat_count = frappe.get_cached_value("LMS Batch", name, "seat_count")
-		number_of_students = frappe.db.count("LMS Batch Enrollment", {"batch": name})
-		if seat_count <= number_of_students:
+		if not has_available_seat(name, frappe.session.user):
 			access = False
 			message = _("Batch is sold out.")
 
@@ -575,12 +587,38 @@ def delete_lesson(lesson, chapter):
 	chapter.save()
 
 	# Delete progress
+	uncount_completed_lesson(lesson, chapter.course)
 	frappe.db.delete("LMS Course Progress", {"lesson": lesson})
+	enqueue_course_progress_update(chapter.course)
 
 	# Delete Lesson
 	frappe.db.delete("Course Lesson", lesson)
 
 
+def uncount_completed_lesson(lesson, course):
+	"""Takes the lesson out of the completed lessons of the members who completed it."""
+	members = frappe.get_all(
+		"LMS Course Progress",
+		{"lesson": lesson, "course": course, "status": "Complete"},
+		pluck="member",
+		distinct=True,
+	)
+	if not members:
+		return
+
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
+	(
+		frappe.qb.update(Enrollment)
+		.set(Enrollment.completed_lessons, Enrollment.completed_lessons - 1)
+		.where(
+			(Enrollment.course == course)
+			& (Enrollment.member.isin(members))
+			& (Enrollment.completed_lessons > 0)
+		)
+		.run()
+	)
+
+
 @frappe.whitelist()
 def update_lesson_index(lesson, sourceChapter, targetChapter, idx):
 	hasMoved = sourceChapter == targetChapter
@@ -589,6 +627,8 @@ def update_lesson_index(lesson, sourceChapter, targetChapter, idx):
 	if not hasMoved:
 		update_target_chapter(lesson, targetChapter, idx)
 
+	clear_course_outline_cache(frappe.db.get_value("Course Chapter", sourceChapter, "course"))
+
 
 def update_source_chapter(lesson, chapter, idx, hasMoved=False):
 	lessons = frappe.get_all(
@@ -603,6 +643,7 @@ def update_source_chapter(lesson, chapter, idx, hasMoved=False):
 	lessons.remove(lesson)
 	if not hasMoved:
 		frappe.db.delete("Lesson Reference", {"parent": chapter, "lesson": lesson})
+		update_course_counter(frappe.db.get_value("Course Chapter", chapter, "course"), "lessons", -1)
 	else:
 		lessons.insert(idx, lesson)
 
@@ -658,6 +699,8 @@ def update_chapter_index(chapter, course, idx):
 	for i, chapter_name in enumerate(chapters):
 		frappe.db.set_value("Chapter Reference", {"chapter": chapter_name, "parent": course}, "idx", i + 1)
 
+	clear_course_outline_cache(course)
+
 
 @frappe.whitelist(allow_guest=True)
 def get_categories(doctype, filters):
@@ -898,21 +941,75 @@ def get_new_gateway_fields(doctype):
 
 
 def update_course_statistics():
-	courses = frappe.get_all("LMS Course", fields=["name"])
+	"""Recomputes the lesson, enrollment and rating counters of all courses
+	with a few aggregate queries and writes back only the courses that changed.
+
+	The counters are maintained incrementally by the enrollment, review and
+	lesson reference controllers, this only reconciles any drift."""
+	precision = cint(frappe.get_system_settings("float_precision")) or 3
+	lessons = get_lesson_counts()
+	enrollments = get_enrollment_counts()
+	ratings = get_average_ratings()
+
+	updates = {}
+	for course in frappe.get_all("LMS Course", fields=["name", "lessons", "enrollments", "rating"]):
+		statistics = {
+			"lessons": lessons.get(course.name, 0),
+			"enrollments": enrollments.get(course.name, 0),
+			"rating": flt(ratings.get(course.name, 0), precision),
+		}
 
-	for course in courses:
-		lessons = get_lesson_count(course.name)
+		if (
+			cint(course.lessons) != statistics["lessons"]
+			or cint(course.enrollments) != statistics["enrollments"]
+			or flt(course.rating, precision) != statistics["rating"]
+		):
+			updates[course.name] = statistics
+
+	if updates:
+		frappe.db.bulk_update("LMS Course", updates, update_modified=False)
+
+
+def get_lesson_counts():
+	ChapterReference = frappe.qb.DocType("Chapter Reference")
+	LessonReference = frappe.qb.DocType("Lesson Reference")
+
+	rows = (
+		frappe.qb.from_(ChapterReference)
+		.join(LessonReference)
+		.on(LessonReference.parent == ChapterReference.chapter)
+		.select(ChapterReference.parent, Count(LessonReference.name).as_("count"))
+		.where(ChapterReference.parenttype == "LMS Course")
+		.groupby(ChapterReference.parent)
+		.run(as_dict=True)
+	)
+	return {row.parent: row.count for row in rows}
 
-		enrollments = frappe.db.count("LMS Enrollment", {"course": course.name, "member_type": "Student"})
 
-		avg_rating = get_average_rating(course.name) or 0
-		avg_rating = flt(avg_rating, frappe.get_system_settings("float_precision") or 3)
+def get_enrollment_counts():
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
 
-		frappe.db.set_value(
-			"LMS Course",
-			course.name,
-			{"lessons": lessons, "enrollments": enrollments, "rating": avg_rating},
-		)
+	rows = (
+		frappe.qb.from_(Enrollment)
+		.select(Enrollment.course, Count(Enrollment.name).as_("count"))
+		.where(Enrollment.member_type == "Student")
+		.groupby(Enrollment.course)
+		.run(as_dict=True)
+	)
+	return {row.course: row.count for row in rows}
+
+
+def get_average_ratings():
+	Review = frappe.qb.DocType("LMS Course Review")
+
+	rows = (
+		frappe.qb.from_(Review)
+		.select(Review.course, Avg(Review.rating).as_("rating"))
+		.groupby(Review.course)
+		.run(as_dict=True)
+	)
+	out_of_ratings = get_out_of_ratings()
+	return {row.course: flt(row.rating) * out_of_ratings for row in rows}
 
 
 @frappe.whitelist()
@@ -980,17 +1077,20 @@ def delete_course(course):
 	frappe.db.delete("LMS Quiz Submission", {"course": course})
 	frappe.db.delete("LMS Enrollment", {"course": course})
 	frappe.delete_doc("LMS Course", course)
+	clear_course_outline_cache(course)
 
 
 @frappe.whitelist()
 def delete_batch(batch):
 	frappe.db.delete("LMS Batch Enrollment", {"batch": batch})
+	frappe.db.delete("LMS Seat Hold", {"batch": batch})
 	frappe.db.delete("Batch Course", {"parent": batch, "parenttype": "LMS Batch"})
 	frappe.db.delete("LMS Assessment", {"parent": batch, "parenttype": "LMS Batch"})
 	frappe.db.delete("LMS Batch Timetable", {"parent": batch, "parenttype": "LMS Batch"})
 	frappe.db.delete("LMS Batch Feedback", {"batch": batch})
 	delete_batch_discussions(batch)
 	frappe.db.delete("LMS Batch", batch)
+	clear_batch_details_cache(batch)
 
 
 def delete_batch_discussions(batch):
@@ -1150,7 +1250,7 @@ def add_lesson(title, chapter, course, idx):
 @frappe.whitelist()
 def delete_chapter(chapter):
 	chapterInfo = frappe.db.get_value(
-		"Course Chapter", chapter, ["is_scorm_package", "scorm_package_path"], as_dict=True
+		"Course Chapter", chapter, ["course", "is_scorm_package", "scorm_package_path"], as_dict=True
 	)
 
 	if chapterInfo.is_scorm_package:
@@ -1160,6 +1260,9 @@ def delete_chapter(chapter):
 	frappe.db.delete("Lesson Reference", {"parent": chapter})
 	frappe.db.delete("Course Lesson", {"chapter": chapter})
 	frappe.db.delete("Course Chapter", chapter)
+	clear_course_outline_cache(chapterInfo.course)
+	refresh_course_lesson_count(chapterInfo.course)
+	enqueue_course_progress_update(chapterInfo.course)
 
 
 def delete_scorm_package(scorm_package_path):
@@ -1170,11 +1273,8 @@ def delete_scorm_package(scorm_package_path):
 
 @frappe.whitelist()
 def mark_lesson_progress(course, chapter_number, lesson_number):
-	chapter_name = frappe.get_value("Chapter Reference", {"parent": course, "idx": chapter_number}, "chapter")
-	lesson_name = frappe.get_value(
-		"Lesson Reference", {"parent": chapter_name, "idx": lesson_number}, "lesson"
-	)
-	save_progress(lesson_name, course)
+	reference = get_lesson_at(course, chapter_number, lesson_number)
+	save_progress(reference.name if reference else None, course)
 
 
 @frappe.whitelist()
@@ -1185,10 +1285,7 @@ def get_heatmap_data(member=None, base_days=200):
 	base_date, start_date, number_of_days, days = calculate_date_ranges(base_days)
 	date_count = initialize_date_count(days)
 
-	lesson_completions, quiz_submissions, assignment_submissions = fetch_activity_data(member, start_date)
-	count_dates(lesson_completions, date_count)
-	count_dates(quiz_submissions, date_count)
-	count_dates(assignment_submissions, date_count)
+	count_dates(fetch_activity_data(member, start_date), date_count)
 
 	heatmap_data, labels, total_activities, weeks = prepare_heatmap_data(
 		start_date, number_of_days, date_count
@@ -1221,32 +1318,20 @@ def initialize_date_count(days):
 
 
 def fetch_activity_data(member, start_date):
-	lesson_completions = frappe.get_all(
-		"LMS Course Progress",
-		fields=["creation"],
-		filters={"member": member, "creation": [">=", start_date], "status": "Complete"},
-	)
-
-	quiz_submissions = frappe.get_all(
-		"LMS Quiz Submission",
-		fields=["creation"],
-		filters={"member": member, "creation": [">=", start_date]},
-	)
-
-	assignment_submissions = frappe.get_all(
-		"LMS Assignment Submission",
-		fields=["creation"],
-		filters={"member": member, "creation": [">=", start_date]},
+	return frappe.get_all(
+		"LMS Daily Activity",
+		fields=["date", "lesson_completions", "quiz_submissions", "assignment_submissions"],
+		filters={"member": member, "date": [">=", start_date]},
 	)
 
-	return lesson_completions, quiz_submissions, assignment_submissions
-
 
 def count_dates(data, date_count):
 	for entry in data:
-		date = format_date(entry.creation, "YYYY-MM-dd")
+		date = format_date(entry.date, "YYYY-MM-dd")
 		if date in date_count:
-			date_count[date] += 1
+			date_count[date] += (
+				entry.lesson_completions + entry.quiz_submissions + entry.assignment_submissions
+			)
 
 
 def prepare_heatmap_data(start_date, number_of_days, date_count):
@@ -1643,58 +1728,60 @@ def track_new_watch_time(lesson, video):
 
 
 @frappe.whitelist()
-def get_course_progress_distribution(course):
-	all_progress = frappe.get_all(
-		"LMS Enrollment",
-		{
-			"course": course,
-		},
-		pluck="progress",
+def get_course_progress_distribution(course, bucket_size=20, batch=None):
+	bucket_size = min(max(cint(bucket_size) or 20, 1), 100)
+	return get_progress_distribution(course, bucket_size, batch)
+
+
+@redis_cache(ttl=5 * 60)
+def get_progress_distribution(course, bucket_size=20, batch=None):
+	"""Returns the average progress and the progress histogram of the course,
+	optionally limited to the students of a batch, from one GROUP BY query."""
+	bucket_count = -(100 // -bucket_size)
+	batch_condition = ""
+	if batch:
+		batch_condition = """
+			JOIN `tabLMS Batch Enrollment` batch_enrollment
+			ON batch_enrollment.member = enrollment.member AND batch_enrollment.batch = %(batch)s
+		"""
+
+	buckets = frappe.db.sql(
+		f"""
+		SELECT
+			LEAST(
+				GREATEST(FLOOR(IFNULL(enrollment.progress, 0) / %(bucket_size)s), 0),
+				%(last_bucket)s
+			) AS bucket,
+			COUNT(*) AS count,
+			SUM(IFNULL(enrollment.progress, 0)) AS total_progress
+		FROM `tabLMS Enrollment` enrollment
+		{batch_condition}
+		WHERE enrollment.course = %(course)s
+		GROUP BY bucket
+		""",
+		{"course": course, "batch": batch, "bucket_size": bucket_size, "last_bucket": bucket_count - 1},
+		as_dict=True,
 	)
 
-	average_progress = get_average_course_progress(all_progress)
-	progress_distribution = get_progress_distribution(all_progress)
+	counts = {cint(row.bucket): row.count for row in buckets}
+	enrollments = sum(counts.values())
+	total_progress = sum(flt(row.total_progress) for row in buckets)
 
 	return {
-		"average_progress": average_progress,
-		"progress_distribution": progress_distribution,
+		"average_progress": flt(
+			total_progress / enrollments if enrollments else 0,
+			frappe.get_system_settings("float_precision") or 3,
+		),
+		"progress_distribution": [
+			{
+				"category": f"{i * bucket_size}-{min((i + 1) * bucket_size, 100)}%",
+				"count": counts.get(i, 0),
+			}
+			for i in range(bucket_count)
+		],
 	}
 
 
-def get_average_course_progress(progress_list):
-	if not progress_list:
-		return 0
-	average_progress = sum(progress_list) / len(progress_list)
-	return flt(average_progress, frappe.get_system_settings("float_precision") or 3)
-
-
-def get_progress_distribution(progressList):
-	distribution = [
-		{
-			"category": "0-20%",
-			"count": len([p for p in progressList if 0 <= p < 20]),
-		},
-		{
-			"category": "20-40%",
-			"count": len([p for p in progressList if 20 <= p < 40]),
-		},
-		{
-			"category": "40-60%",
-			"count": len([p for p in progressList if 40 <= p < 60]),
-		},
-		{
-			"category": "60-80%",
-			"count": len([p for p in progressList if 60 <= p < 80]),
-		},
-		{
-			"category": "80-100%",
-			"count": len([p for p in progressList if 80 <= p <= 100]),
-		},
-	]
-
-	return distribution
-
-
 @frappe.whitelist(allow_guest=True)
 def get_pwa_manifest():
 	title = frappe.db.get_single_value("Website Settings", "app_name") or "Frappe Learning"
@@ -1747,71 +1834,22 @@ def get_streak_info():
 	if frappe.session.user == "Guest":
 		return {}
 
-	all_dates = fetch_activity_dates(frappe.session.user)
-	streak, longest_streak = calculate_streaks(all_dates)
-	current_streak = calculate_current_streak(all_dates, streak)
+	streak = frappe.db.get_value(
+		"LMS Streak",
+		frappe.session.user,
+		["current_streak", "longest_streak", "last_active_date"],
+		as_dict=1,
+	)
+	if not streak:
+		return {"current_streak": 0, "longest_streak": 0}
 
+	active_dates = [getdate(streak.last_active_date)] if streak.last_active_date else []
 	return {
-		"current_streak": current_streak,
-		"longest_streak": longest_streak,
+		"current_streak": calculate_current_streak(active_dates, streak.current_streak),
+		"longest_streak": streak.longest_streak,
 	}
 
 
-def fetch_activity_dates(user):
-	doctypes = [
-		"LMS Course Progress",
-		"LMS Quiz Submission",
-		"LMS Assignment Submission",
-		"LMS Programming Exercise Submission",
-	]
-
-	all_dates = []
-	for dt in doctypes:
-		all_dates.extend(frappe.get_all(dt, {"member": user}, pluck="creation"))
-
-	return sorted({d.date() if hasattr(d, "date") else d for d in all_dates})
-
-
-def calculate_streaks(all_dates):
-	streak = 0
-	longest_streak = 0
-	prev_day = None
-
-	for d in all_dates:
-		if d.weekday() in (5, 6):
-			continue
-
-		if prev_day:
-			expected = prev_day + timedelta(days=1)
-			while expected.weekday() in (5, 6):
-				expected += timedelta(days=1)
-
-			streak = streak + 1 if d == expected else 1
-		else:
-			streak = 1
-
-		longest_streak = max(longest_streak, streak)
-		prev_day = d
-
-	return streak, longest_streak
-
-
-def calculate_current_streak(all_dates, streak):
-	if not all_dates:
-		return 0
-
-	last_date = all_dates[-1]
-	today = getdate()
-
-	ref_day = today
-	while ref_day.weekday() in (5, 6):
-		ref_day -= timedelta(days=1)
-
-	if last_date == ref_day or last_date == ref_day - timedelta(days=1):
-		return streak
-	return 0
-
-
 @frappe.whitelist()
 def get_my_live_classes():
 	my_live_classes = []
@@ -1878,13 +1916,7 @@ def get_created_courses():
 	)
 
 	results = query.run(as_dict=True)
-	courses = [row["name"] for row in results]
-
-	for course in courses:
-		course_details = get_course_details(course)
-		created_courses.append(course_details)
-
-	return created_courses
+	return get_course_cards([row["name"] for row in results])
 
 
 @frappe.whitelist()
@@ -1995,10 +2027,7 @@ def get_my_courses():
 	if not len(courses):
 		courses = get_popular_courses()
 
-	for course in courses:
-		my_courses.append(get_course_details(course))
-
-	return my_courses
+	return get_course_cards(courses)
 
 
 def get_my_latest_courses():
@@ -0,0 +1,442 @@
+"""Bulk enrollment of members in a batch or a course.
+
+The members are read from a CSV or JSON list of emails and validated as a
+set, against the existing users, the current members, the eligibility for
+the courses and the seats left. The seats of a batch are reserved for the
+whole import up front. The enrollments are then inserted in chunks by a
+background job, which releases the seats of the members it had to skip and
+reports them to the member who started the import. The welcome
+notifications are sent by a single queued job at the end.
+"""
+
+import json
+from collections import Counter
+
+import frappe
+from frappe import _
+from frappe.desk.doctype.notification_log.notification_log import make_notification_logs
+from frappe.utils import cint, now
+from frappe.utils.csvutils import read_csv_content
+
+from lms.lms.doctype.lms_batch_enrollment.lms_batch_enrollment import get_batch_email_details, send_mail
+from lms.lms.doctype.lms_enrollment.lms_enrollment import update_program_members_progress
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import release_seats, update_reserved_seats
+from lms.lms.utils import (
+	can_create_batches,
+	clear_batch_details_cache,
+	has_moderator_role,
+	is_instructor,
+	update_course_counter,
+)
+
+CHUNK_SIZE = 500
+
+
+@frappe.whitelist()
+def import_enrollments(doctype, docname, data=None, file_url=None):
+	"""Validates the members to enroll and enrolls them in the background.
+
+	`data` is a JSON list of emails or of objects with a member or email key,
+	`file_url` is an uploaded CSV or JSON file with the same content."""
+	validate_permission(doctype, docname)
+
+	members = parse_members(data, file_url)
+	if not members:
+		frappe.throw(_("No members found to enroll."))
+
+	summary = validate_members(doctype, docname, members)
+	if summary.members:
+		if doctype == "LMS Batch":
+			reserve_import_seats(docname, len(summary.members))
+
+		frappe.enqueue(
+			"lms.lms.bulk_enrollment.enroll_members",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+			doctype=doctype,
+			docname=docname,
+			members=summary.members,
+		)
+
+	return {
+		"enrolling": len(summary.members),
+		"invalid_users": summary.invalid_users,
+		"duplicates": summary.duplicates,
+		"already_enrolled": summary.already_enrolled,
+		"ineligible": summary.ineligible,
+	}
+
+
+def validate_permission(doctype, docname):
+	if doctype not in ("LMS Batch", "LMS Course"):
+		frappe.throw(_("Members can only be imported into a batch or a course."))
+
+	if not frappe.db.exists(doctype, docname):
+		frappe.throw(_("{0} {1} does not exist.").format(_(doctype), docname))
+
+	if doctype == "LMS Batch":
+		allowed = can_create_batches()
+	else:
+		allowed = has_moderator_role() or is_instructor(docname)
+
+	if not allowed:
+		frappe.throw(_("You are not permitted to enroll members here."), frappe.PermissionError)
+
+
+def parse_members(data=None, file_url=None):
+	"""Returns the emails in the JSON data or the uploaded CSV/JSON file, in their original order."""
+	rows = []
+	if file_url:
+		file = frappe.get_doc("File", {"file_url": file_url})
+		frappe.has_permission("File", doc=file, throw=True)
+		content = file.get_content()
+		if isinstance(content, bytes):
+			content = content.decode("utf-8-sig")
+
+		if file_url.lower().endswith(".json"):
+			rows = json.loads(content)
+		else:
+			rows = get_csv_members(read_csv_content(content))
+	elif data:
+		rows = json.loads(data) if isinstance(data, str) else data
+
+	members = []
+	for row in rows:
+		if isinstance(row, dict):
+			row = row.get("member") or row.get("email")
+		if row and str(row).strip():
+			members.append(str(row).strip().lower())
+
+	return members
+
+
+def get_csv_members(rows):
+	"""Reads the member or email column of the CSV, or the first column if it has no header."""
+	if not rows:
+		return []
+
+	header = [str(cell).strip().lower() for cell in rows[0]]
+	for column in ("member", "email"):
+		if column in header:
+			index = header.index(column)
+			return [row[index] for row in rows[1:] if len(row) > index]
+
+	return [row[0] for row in rows if row]
+
+
+def validate_members(doctype, docname, members):
+	"""Splits the members into the ones to enroll and the ones to skip, with one query per check."""
+	unique_members = list(dict.fromkeys(members))
+	duplicates = [member for member, count in Counter(members).items() if count > 1]
+
+	users = set(frappe.get_all("User", {"name": ["in", unique_members], "enabled": 1}, pluck="name"))
+	invalid_users = [member for member in unique_members if member not in users]
+
+	enrolled = set(get_enrolled_members(doctype, docname, list(users)))
+	already_enrolled = [member for member in unique_members if member in enrolled]
+	to_enroll = [member for member in unique_members if member in users and member not in enrolled]
+
+	not_eligible = get_ineligible_members(get_courses(doctype, docname), to_enroll)
+	ineligible = [member for member in to_enroll if member in not_eligible]
+	to_enroll = [member for member in to_enroll if member not in not_eligible]
+
+	return frappe._dict(
+		{
+			"members": to_enroll,
+			"invalid_users": invalid_users,
+			"duplicates": duplicates,
+			"already_enrolled": already_enrolled,
+			"ineligible": ineligible,
+		}
+	)
+
+
+def get_enrolled_members(doctype, docname, members):
+	if not members:
+		return []
+
+	if doctype == "LMS Batch":
+		return frappe.get_all(
+			"LMS Batch Enrollment", {"batch": docname, "member": ["in", members]}, pluck="member"
+		)
+
+	return frappe.get_all("LMS Enrollment", {"course": docname, "member": ["in", members]}, pluck="member")
+
+
+def get_courses(doctype, docname):
+	if doctype == "LMS Course":
+		return [docname]
+
+	return frappe.get_all("Batch Course", {"parent": docname, "parenttype": "LMS Batch"}, pluck="course")
+
+
+def get_ineligible_members(courses, members):
+	"""Returns the members who can't be enrolled in one of the courses they are not enrolled in yet,
+	with the checks of `LMSEnrollment.validate_course_enrollment_eligibility` applied to the whole set."""
+	ineligible = set()
+	for course in courses:
+		pending = set(members) - set(get_enrolled_members("LMS Course", course, members))
+		if not pending:
+			continue
+
+		details = frappe.db.get_value(
+			"LMS Course", course, ["published", "disable_self_learning", "paid_course"], as_dict=True
+		)
+		if not details.published or details.disable_self_learning:
+			ineligible |= pending
+		elif details.paid_course:
+			paid = frappe.get_all(
+				"LMS Payment",
+				{
+					"reference_doctype": "LMS Course",
+					"reference_docname": course,
+					"member": ["in", list(pending)],
+					"payment_receipt": 1,
+				},
+				pluck="member",
+			)
+			ineligible |= pending - set(paid)
+
+	return ineligible
+
+
+def reserve_import_seats(batch, count):
+	"""Reserves the seats of the whole import, under the lock of the batch row."""
+	seat_count, reserved_seats = frappe.db.get_value(
+		"LMS Batch", batch, ["seat_count", "reserved_seats"], for_update=True
+	)
+	seats_left = cint(seat_count) - cint(reserved_seats)
+	if cint(seat_count) and count > seats_left:
+		frappe.throw(
+			_("Only {0} seats are left in this batch, but {1} members are being enrolled.").format(
+				max(seats_left, 0), count
+			)
+		)
+
+	update_reserved_seats(batch, count)
+
+
+def enroll_members(doctype, docname, members, chunk_size=CHUNK_SIZE):
+	"""Inserts the enrollments in chunks, committing every chunk, and queues the welcome notifications.
+
+	Members who can't be enrolled any more, and the members of a chunk that failed, are skipped.
+	Their seats are released and they are reported to the member who started the import."""
+	enrolled, skipped = [], []
+	for start in range(0, len(members), chunk_size):
+		chunk = members[start : start + chunk_size]
+		try:
+			chunk_enrolled = enroll_chunk(doctype, docname, chunk)
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(title=_("Bulk enrollment in {0} failed").format(docname))
+			chunk_enrolled = []
+
+		done = set(chunk_enrolled)
+		chunk_skipped = [member for member in chunk if member not in done]
+		if doctype == "LMS Batch" and chunk_skipped:
+			release_seats(docname, len(chunk_skipped))
+			frappe.db.commit()
+
+		enrolled += chunk_enrolled
+		skipped += chunk_skipped
+		frappe.publish_progress(
+			min(start + chunk_size, len(members)) * 100 / len(members),
+			title=_("Enrolling Members"),
+			doctype=doctype,
+			docname=docname,
+			description=_("{0} of {1} members enrolled, {2} skipped").format(
+				len(enrolled), len(members), len(skipped)
+			),
+		)
+
+	send_import_report(doctype, docname, enrolled, skipped)
+	if enrolled:
+		frappe.enqueue(
+			"lms.lms.bulk_enrollment.send_welcome_notifications",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+			doctype=doctype,
+			docname=docname,
+			members=enrolled,
+		)
+
+
+def enroll_chunk(doctype, docname, members):
+	"""Enrolls the members who are still not enrolled and eligible, and returns them."""
+	courses = get_courses(doctype, docname)
+	# Members may have enrolled on their own, or the courses changed, since the import was validated
+	existing = set(get_enrolled_members(doctype, docname, members))
+	members = [member for member in members if member not in existing]
+	ineligible = get_ineligible_members(courses, members)
+	members = [member for member in members if member not in ineligible]
+
+	if doctype == "LMS Batch":
+		enroll_in_batch(docname, members, courses)
+	else:
+		enroll_in_course(docname, members)
+
+	return members
+
+
+def enroll_in_batch(batch, members, courses):
+	"""Enrolls the members in the batch and its courses. Their seats were reserved with the import."""
+	if not members:
+		return
+
+	convert_seat_holds(batch, members)
+	users = get_user_details(members)
+	insert_rows(
+		"LMS Batch Enrollment",
+		["batch", "member", "member_name", "member_username"],
+		[(batch, member, users[member].full_name, users[member].username) for member in members],
+	)
+
+	for course in courses:
+		enrolled = get_enrolled_members("LMS Course", course, members)
+		enroll_in_course(course, [member for member in members if member not in enrolled], users)
+
+	add_members_to_live_classes(batch, members)
+	clear_batch_details_cache(batch)
+
+
+def convert_seat_holds(batch, members):
+	"""Converts the seats held for the payments of the members, whose seats were reserved with the import."""
+	holds = frappe.get_all(
+		"LMS Seat Hold", {"batch": batch, "member": ["in", members], "status": "Active"}, pluck="name"
+	)
+	if not holds:
+		return
+
+	SeatHold = frappe.qb.DocType("LMS Seat Hold")
+	frappe.qb.update(SeatHold).set(SeatHold.status, "Converted").where(SeatHold.name.isin(holds)).run()
+	release_seats(batch, len(holds))
+
+
+def enroll_in_course(course, members, users=None):
+	if not members:
+		return
+
+	users = users or get_user_details(members)
+	insert_rows(
+		"LMS Enrollment",
+		["course", "member", "member_name", "member_username", "member_type", "role"],
+		[
+			(course, member, users[member].full_name, users[member].username, "Student", "Member")
+			for member in members
+		],
+	)
+	update_course_counter(course, "enrollments", len(members))
+
+	programs = frappe.get_all(
+		"LMS Program Course", {"course": course, "parenttype": "LMS Program"}, pluck="parent", distinct=True
+	)
+	for program in programs:
+		update_program_members_progress(program, members)
+
+
+def get_user_details(members):
+	users = frappe.get_all("User", {"name": ["in", members]}, ["name", "full_name", "username"])
+	return {user.name: user for user in users}
+
+
+def add_members_to_live_classes(batch, members):
+	events = frappe.get_all(
+		"LMS Live Class", {"batch_name": batch, "event": ["is", "set"]}, pluck="event", distinct=True
+	)
+	for event in events:
+		idx = cint(
+			frappe.db.get_value(
+				"Event Participants", {"parent": event, "parenttype": "Event"}, "max(idx)", order_by=None
+			)
+		)
+		insert_rows(
+			"Event Participants",
+			["parent", "parenttype", "parentfield", "idx", "reference_doctype", "reference_docname", "email"],
+			[
+				(event, "Event", "event_participants", idx + i, "User", member, member)
+				for i, member in enumerate(members, start=1)
+			],
+		)
+
+
+def insert_rows(doctype, fields, values):
+	"""Inserts the rows with one statement, with the standard fields set like a regular insert."""
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		doctype,
+		["name", *fields, "owner", "modified_by", "creation", "modified"],
+		[(frappe.generate_hash(length=10), *row, user, user, timestamp, timestamp) for row in values],
+	)
+
+
+def send_import_report(doctype, docname, enrolled, skipped):
+	"""Tells the member who started the import how many members were enrolled and which were skipped."""
+	notification = frappe._dict(
+		{
+			"subject": _("{0} members were enrolled in {1} {2}").format(len(enrolled), _(doctype), docname),
+			"document_type": doctype,
+			"document_name": docname,
+			"type": "Alert",
+		}
+	)
+	if skipped:
+		notification.email_content = _(
+			"{0} members were skipped as they were already enrolled, not eligible or could not be enrolled: {1}"
+		).format(len(skipped), ", ".join(skipped))
+
+	make_notification_logs(notification, [frappe.session.user])
+
+
+def send_welcome_notifications(doctype, docname, members):
+	"""Sends the confirmation email of the batch or the welcome alert of the course to the new members."""
+	if doctype == "LMS Batch":
+		send_batch_confirmation_emails(docname, members)
+		return
+
+	title = frappe.db.get_value("LMS Course", docname, "title")
+	notification = frappe._dict(
+		{
+			"subject": _("You have been enrolled in the course {0}").format(title),
+			"document_type": "LMS Course",
+			"document_name": docname,
+			"from_user": frappe.session.user,
+			"type": "Alert",
+			"link": f"/lms/courses/{docname}",
+		}
+	)
+	make_notification_logs(notification, members)
+
+
+def send_batch_confirmation_emails(batch, members):
+	outgoing_email_account = frappe.get_cached_value(
+		"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
+	)
+	if not outgoing_email_account and not frappe.conf.get("mail_login"):
+		return
+
+	batch_details = get_batch_email_details(batch)
+	batch_details.confirmation_email_template = batch_details.confirmation_email_template or (
+		frappe.db.get_single_value("LMS Settings", "batch_confirmation_template")
+	)
+	enrollments = frappe.get_all(
+		"LMS Batch Enrollment",
+		{"batch": batch, "member": ["in", members], "confirmation_email_sent": 0},
+		["name", "member", "member_name"],
+	)
+	if not enrollments:
+		return
+
+	for enrollment in enrollments:
+		send_mail(enrollment, batch_details)
+
+	Enrollment = frappe.qb.DocType("LMS Batch Enrollment")
+	(
+		frappe.qb.update(Enrollment)
+		.set(Enrollment.confirmation_email_sent, 1)
+		.where(Enrollment.name.isin([enrollment.name for enrollment in enrollments]))
+		.run()
+	)
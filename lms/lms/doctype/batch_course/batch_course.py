@@ -4,6 +4,10 @@
 # import frappe
 from frappe.model.document import Document
 
+from lms.lms.utils import clear_batch_details_cache
+
 
 class BatchCourse(Document):
-	pass
+	def on_trash(self):
+		# Courses are removed from a batch with delete_doc, which does not save the batch
+		clear_batch_details_cache(self.parent)
@@ -4,26 +4,31 @@
 import frappe
 from frappe.model.document import Document
 
-from lms.lms.utils import get_course_progress, get_lesson_count
+from lms.lms.doctype.lms_enrollment.lms_enrollment import enqueue_course_progress_update
+from lms.lms.utils import clear_course_outline_cache, refresh_course_lesson_count
 
 
 class CourseChapter(Document):
 	def on_update(self):
-		self.recalculate_course_progress()
+		clear_course_outline_cache(self.course)
 		self.update_lesson_count()
-		frappe.enqueue(method=self.recalculate_course_progress, queue="short", timeout=300, is_async=True)
+		self.recalculate_course_progress()
+
+	def on_trash(self):
+		clear_course_outline_cache(self.course)
 
 	def recalculate_course_progress(self):
 		"""Recalculate course progress if a new lesson is added or removed"""
-		previous_lessons = self.get_doc_before_save() and self.get_doc_before_save().as_dict().lessons
-		current_lessons = self.lessons
+		doc_before_save = self.get_doc_before_save()
+		if not doc_before_save:
+			return
+
+		previous_lessons = {row.lesson for row in doc_before_save.lessons}
+		current_lessons = {row.lesson for row in self.lessons}
 
-		if previous_lessons and previous_lessons != current_lessons:
-			enrolled_members = frappe.get_all("LMS Enrollment", {"course": self.course}, ["member", "name"])
-			for enrollment in enrolled_members:
-				new_progress = get_course_progress(self.course, enrollment.member)
-				frappe.db.set_value("LMS Enrollment", enrollment.name, "progress", new_progress)
+		if previous_lessons != current_lessons:
+			enqueue_course_progress_update(self.course)
 
 	def update_lesson_count(self):
 		"""Update lesson count in the course"""
-		frappe.db.set_value("LMS Course", self.course, "lessons", get_lesson_count(self.course))
+		refresh_course_lesson_count(self.course)
@@ -6,17 +6,33 @@ import json
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.realtime import get_website_room
+from frappe.utils import cint, now
 from frappe.utils.telemetry import capture
 
-from lms.lms.utils import get_course_progress
+from lms.lms.doctype.lms_badge.lms_badge import process_badges
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import record_activity
+from lms.lms.doctype.lms_enrollment.lms_enrollment import update_program_progress
+from lms.lms.utils import (
+	clear_course_outline_cache,
+	get_lesson_sequence,
+	get_lessons,
+	get_progress_percentage,
+	publish_progress_update,
+)
 
 from ...md import find_macros
 
 
 class CourseLesson(Document):
+	def validate(self):
+		self.set_requirements()
+
 	def on_update(self):
 		self.validate_quiz_id()
+		clear_course_outline_cache(self.course)
+
+	def on_trash(self):
+		clear_course_outline_cache(self.course)
 
 	def validate_quiz_id(self):
 		if self.quiz_id and not frappe.db.exists("LMS Quiz", self.quiz_id):
@@ -28,6 +44,40 @@ class CourseLesson(Document):
 		if self.instructor_content:
 			self.save_lesson_details_in_quiz(self.instructor_content)
 
+	def set_requirements(self):
+		"""Indexes the quizzes and assignments of the lesson content, so that
+		completion can be checked without parsing the content."""
+		quizzes, assignments = get_lesson_quizzes_and_assignments(self.content, self.body)
+		# Quizzes and assignments that were deleted can't be completed, so they are not required
+		if assignments:
+			existing = set(frappe.get_all("LMS Assignment", {"name": ["in", assignments]}, pluck="name"))
+			assignments = [assignment for assignment in assignments if assignment in existing]
+		passing_percentage = dict(
+			frappe.get_all(
+				"LMS Quiz",
+				{"name": ["in", quizzes]},
+				["name", "passing_percentage"],
+				as_list=True,
+			)
+			if quizzes
+			else []
+		)
+
+		quizzes = [quiz for quiz in quizzes if quiz in passing_percentage]
+
+		self.set("requirements", [])
+		for quiz in quizzes:
+			self.append(
+				"requirements",
+				{
+					"requirement_type": "Quiz",
+					"quiz": quiz,
+					"passing_percentage": passing_percentage.get(quiz),
+				},
+			)
+		for assignment in assignments:
+			self.append("requirements", {"requirement_type": "Assignment", "assignment": assignment})
+
 	def save_lesson_details_in_quiz(self, content):
 		content = json.loads(self.content)
 		for block in content.get("blocks"):
@@ -50,138 +100,296 @@ def save_progress(lesson, course, scorm_details=None):
 	"""
 	Note: Pass the argument scorm_details as a dict if it is SCORM related save_progress
 	"""
-	membership = frappe.db.exists("LMS Enrollment", {"course": course, "member": frappe.session.user})
-	if not membership:
+	member = frappe.session.user
+	enrollment = frappe.db.get_value(
+		"LMS Enrollment",
+		{"course": course, "member": member},
+		["name", "progress"],
+		as_dict=1,
+	)
+	if not enrollment:
 		return 0
 
-	frappe.db.set_value("LMS Enrollment", membership, "current_lesson", lesson)
-	progress_already_exists = frappe.db.exists(
-		"LMS Course Progress", {"lesson": lesson, "member": frappe.session.user}
-	)
-	lesson_already_completed = frappe.db.exists(
-		"LMS Course Progress",
-		{"lesson": lesson, "member": frappe.session.user, "status": "Complete"},
+	if scorm_details:
+		scorm_details = frappe._dict(**scorm_details)
+		if not scorm_details.is_complete:
+			buffer_scorm_progress(member, lesson, scorm_details.scorm_content)
+			return enrollment.progress
+
+		discard_buffered_scorm_progress(member, lesson)
+
+	# Saves of the member in this course wait on the enrollment row, so that a
+	# lesson completed from two tabs gets one progress row and is counted once.
+	frappe.db.get_value("LMS Enrollment", enrollment.name, "name", for_update=True)
+
+	lesson_progress = frappe.db.get_value(
+		"LMS Course Progress", {"lesson": lesson, "member": member}, ["name", "status"], as_dict=1
 	)
+	completed = save_lesson_progress(lesson, lesson_progress, scorm_details)
+
+	if not completed:
+		frappe.db.set_value("LMS Enrollment", enrollment.name, "current_lesson", lesson)
+		return enrollment.progress
+
+	completed_lessons = increment_completed_lessons(enrollment.name, course, lesson)
+	progress = get_progress_percentage(completed_lessons, get_lessons(course, get_details=False))
+	capture_progress_for_analytics(progress, course)
+	update_enrollment_progress(enrollment.name, lesson, progress)
+
+	publish_progress_update(member, course, lesson, progress)
+
+	return progress
 
-	quiz_completed = get_quiz_progress(lesson)
-	assignment_completed = get_assignment_progress(lesson)
+
+def save_lesson_progress(lesson, lesson_progress, scorm_details=None):
+	"""Creates or updates the progress row of the lesson for the session user.
+	Returns True if the lesson got completed with this call."""
+	if lesson_progress and lesson_progress.status == "Complete":
+		return False
 
 	if scorm_details:
-		scorm_details = frappe._dict(**scorm_details)
+		status = "Complete" if scorm_details.is_complete else "Partially Complete"
+		values = {
+			"status": status,
+			"scorm_content": "" if scorm_details.is_complete else scorm_details.scorm_content,
+		}
+		if lesson_progress:
+			update_lesson_progress(lesson_progress.name, values)
+			if status == "Complete":
+				record_activity(frappe.session.user, "lesson_completions")
+		else:
+			insert_lesson_progress(lesson, values)
+		return status == "Complete"
+
+	if lesson_progress or not requirements_completed(lesson):
+		return False
+
+	insert_lesson_progress(lesson, {"status": "Complete"})
+	return True
 
-	if not progress_already_exists and quiz_completed and assignment_completed and not scorm_details:
-		frappe.get_doc(
-			{
-				"doctype": "LMS Course Progress",
-				"lesson": lesson,
-				"status": "Complete",
-				"member": frappe.session.user,
-			}
-		).save(ignore_permissions=True)
-	elif scorm_details and not lesson_already_completed and not progress_already_exists:
-		# Create new SCORM progress
-		frappe.get_doc(
-			{
-				"doctype": "LMS Course Progress",
-				"lesson": lesson,
-				"status": "Complete" if scorm_details.is_complete else "Partially Complete",
-				"member": frappe.session.user,
-				"scorm_content": "" if scorm_details.is_complete else scorm_details.scorm_content,
-			}
-		).save(ignore_permissions=True)
-	elif scorm_details and not lesson_already_completed and progress_already_exists:
-		# Update Existing SCORM Progress
-		frappe.db.set_value(
-			"LMS Course Progress",
-			progress_already_exists,
-			{
-				"lesson": lesson,
-				"status": "Complete" if scorm_details.is_complete else "Partially Complete",
-				"member": frappe.session.user,
-				"scorm_content": "" if scorm_details.is_complete else scorm_details.scorm_content,
-			},
+
+def insert_lesson_progress(lesson, values, member=None):
+	frappe.get_doc(
+		{
+			"doctype": "LMS Course Progress",
+			"lesson": lesson,
+			"member": member or frappe.session.user,
+			**values,
+		}
+	).insert(ignore_permissions=True)
+
+
+def update_lesson_progress(name, values, update_modified=True):
+	"""Updates a progress row unless it is already complete, so that a stale
+	partial state never overwrites a completion."""
+	Progress = frappe.qb.DocType("LMS Course Progress")
+	query = frappe.qb.update(Progress).where((Progress.name == name) & (Progress.status != "Complete"))
+	for field, value in values.items():
+		query = query.set(Progress[field], value)
+	if update_modified:
+		query = query.set(Progress.modified, now()).set(Progress.modified_by, frappe.session.user)
+
+	query.run()
+
+
+def increment_completed_lessons(enrollment, course, lesson):
+	"""Adds the completed lesson to the counter of the enrollment and returns the new count.
+	Lessons that are not part of the course outline are not counted."""
+	if lesson in get_lesson_sequence(course).positions:
+		Enrollment = frappe.qb.DocType("LMS Enrollment")
+		(
+			frappe.qb.update(Enrollment)
+			.set(Enrollment.completed_lessons, Enrollment.completed_lessons + 1)
+			.where(Enrollment.name == enrollment)
+			.run()
 		)
 
-	progress = get_course_progress(course)
-	capture_progress_for_analytics(progress, course)
+	return cint(frappe.db.get_value("LMS Enrollment", enrollment, "completed_lessons"))
+
+
+SCORM_PROGRESS_BUFFER = "lms_scorm_progress"
+
+
+def get_scorm_progress_key(member, lesson):
+	return f"{member}::{lesson}"
 
-	# Had to get doc, as on_change doesn't trigger when you use set_value. The trigger is necessary for badge to get assigned.
-	enrollment = frappe.get_doc("LMS Enrollment", membership)
-	enrollment.progress = progress
-	enrollment.save()
-	enrollment.run_method("on_change")
-
-	frappe.publish_realtime(
-		event="update_lesson_progress",
-		room=get_website_room(),
-		message={"course": course, "lesson": lesson, "progress": progress},
-		after_commit=True,
+
+def buffer_scorm_progress(member, lesson, scorm_content):
+	"""Keeps the latest partial SCORM state of the member in redis.
+	It is written to LMS Course Progress by `flush_scorm_progress`."""
+	frappe.cache().hset(
+		SCORM_PROGRESS_BUFFER,
+		get_scorm_progress_key(member, lesson),
+		{"member": member, "lesson": lesson, "scorm_content": scorm_content},
 	)
 
+
+def discard_buffered_scorm_progress(member, lesson):
+	frappe.cache().hdel(SCORM_PROGRESS_BUFFER, get_scorm_progress_key(member, lesson))
+
+
+@frappe.whitelist()
+def get_scorm_progress(lesson):
+	"""Returns the SCORM progress of the session user, including the state
+	that has not been flushed to the database yet."""
+	member = frappe.session.user
+	progress = frappe.db.get_value(
+		"LMS Course Progress",
+		{"lesson": lesson, "member": member},
+		["status", "scorm_content"],
+		as_dict=1,
+	) or frappe._dict(status="Partially Complete", scorm_content="")
+
+	if progress.status != "Complete":
+		buffered = frappe.cache().hget(SCORM_PROGRESS_BUFFER, get_scorm_progress_key(member, lesson))
+		if buffered:
+			progress.scorm_content = buffered.get("scorm_content")
+
 	return progress
 
 
+def flush_scorm_progress():
+	"""Writes the buffered SCORM state to LMS Course Progress, one write per
+	member and lesson however many times the player saved in between."""
+	cache = frappe.cache()
+	flushing = f"{SCORM_PROGRESS_BUFFER}_flush"
+
+	# A flush that failed leaves its entries behind, write those first
+	if not cache.exists(flushing):
+		if not cache.exists(SCORM_PROGRESS_BUFFER):
+			return
+
+		# Swap the buffer out atomically so that saves arriving while flushing
+		# go to a fresh buffer and are not lost.
+		cache.rename(cache.make_key(SCORM_PROGRESS_BUFFER), cache.make_key(flushing))
+
+	entries = list(cache.hgetall(flushing).values())
+	if entries:
+		write_scorm_progress(entries)
+		frappe.db.commit()
+
+	# Only dropped once the state is in the database
+	cache.delete_value(flushing)
+
+
+def write_scorm_progress(entries):
+	Progress = frappe.qb.DocType("LMS Course Progress")
+	existing = {
+		get_scorm_progress_key(row.member, row.lesson): row.name
+		for row in frappe.qb.from_(Progress)
+		.select(Progress.name, Progress.member, Progress.lesson)
+		.where(
+			Progress.member.isin([entry["member"] for entry in entries])
+			& Progress.lesson.isin([entry["lesson"] for entry in entries])
+		)
+		.run(as_dict=True)
+	}
+
+	for entry in entries:
+		values = {"status": "Partially Complete", "scorm_content": entry["scorm_content"]}
+		lesson_progress = existing.get(get_scorm_progress_key(entry["member"], entry["lesson"]))
+
+		if lesson_progress:
+			# The lesson may have been completed since the state was buffered
+			update_lesson_progress(lesson_progress, values, update_modified=False)
+		else:
+			insert_lesson_progress(entry["lesson"], values, entry["member"])
+
+
+def update_enrollment_progress(enrollment, lesson, progress):
+	"""Writes the new progress on the enrollment.
+
+	The enrollment document is loaded and saved only when a badge listens to
+	LMS Enrollment, as badges need the document before and after the save.
+	"""
+	if has_enrollment_badges():
+		doc = frappe.get_doc("LMS Enrollment", enrollment)
+		doc.update({"current_lesson": lesson, "progress": progress})
+		doc.save(ignore_permissions=True)
+		process_badges(doc, "on_change")
+		return
+
+	frappe.db.set_value(
+		"LMS Enrollment",
+		enrollment,
+		{"current_lesson": lesson, "progress": progress},
+	)
+	update_program_progress(frappe.session.user)
+
+
+def has_enrollment_badges():
+	return bool(
+		frappe.cache_manager.get_doctype_map(
+			"LMS Badge", "LMS Enrollment", dict(reference_doctype="LMS Enrollment", enabled=1)
+		)
+	)
+
+
 def capture_progress_for_analytics(progress, course):
 	if progress in [25, 50, 75, 100]:
 		capture("course_progress", "lms", properties={"course": course, "progress": progress})
 
 
-def get_quiz_progress(lesson):
-	lesson_details = frappe.db.get_value("Course Lesson", lesson, ["body", "content"], as_dict=1)
-	quizzes = []
+def get_lesson_quizzes_and_assignments(content=None, body=None):
+	"""Returns the quizzes and assignments used in the lesson content."""
+	quizzes, assignments = [], []
 
-	if lesson_details.content:
-		content = json.loads(lesson_details.content)
+	if content:
+		content = json.loads(content)
 
 		for block in content.get("blocks"):
 			if block.get("type") == "quiz":
 				quizzes.append(block.get("data").get("quiz"))
+			if block.get("type") == "assignment":
+				assignments.append(block.get("data").get("assignment"))
 			if block.get("type") == "upload":
 				quizzes_in_video = block.get("data").get("quizzes")
 				if quizzes_in_video and len(quizzes_in_video) > 0:
 					for row in quizzes_in_video:
 						quizzes.append(row.get("quiz"))
 
-	elif lesson_details.body:
-		macros = find_macros(lesson_details.body)
+	elif body:
+		macros = find_macros(body)
 		quizzes = [value for name, value in macros if name == "Quiz"]
-
-	for quiz in quizzes:
-		passing_percentage = frappe.db.get_value("LMS Quiz", quiz, "passing_percentage")
-		if not frappe.db.exists(
-			"LMS Quiz Submission",
-			{
-				"quiz": quiz,
-				"member": frappe.session.user,
-				"percentage": [">=", passing_percentage],
-			},
-		):
-			return False
-	return True
-
-
-def get_assignment_progress(lesson):
-	lesson_details = frappe.db.get_value("Course Lesson", lesson, ["body", "content"], as_dict=1)
-	assignments = []
-
-	if lesson_details.content:
-		content = json.loads(lesson_details.content)
-
-		for block in content.get("blocks"):
-			if block.get("type") == "assignment":
-				assignments.append(block.get("data").get("assignment"))
-
-	elif lesson_details.body:
-		macros = find_macros(lesson_details.body)
 		assignments = [value for name, value in macros if name == "Assignment"]
 
-	for assignment in assignments:
-		if not frappe.db.exists(
-			"LMS Assignment Submission",
-			{"assignment": assignment, "member": frappe.session.user},
-		):
-			return False
-	return True
+	return list(dict.fromkeys(filter(None, quizzes))), list(dict.fromkeys(filter(None, assignments)))
+
+
+def requirements_completed(lesson, member=None):
+	"""Checks the requirements of the lesson against the quiz and assignment
+	submissions of the member in a single query."""
+	member = member or frappe.session.user
+	Requirement = frappe.qb.DocType("Lesson Requirement")
+	QuizSubmission = frappe.qb.DocType("LMS Quiz Submission")
+	AssignmentSubmission = frappe.qb.DocType("LMS Assignment Submission")
+
+	pending = (
+		frappe.qb.from_(Requirement)
+		.left_join(QuizSubmission)
+		.on(
+			(Requirement.requirement_type == "Quiz")
+			& (QuizSubmission.quiz == Requirement.quiz)
+			& (QuizSubmission.member == member)
+			& (QuizSubmission.percentage >= Requirement.passing_percentage)
+		)
+		.left_join(AssignmentSubmission)
+		.on(
+			(Requirement.requirement_type == "Assignment")
+			& (AssignmentSubmission.assignment == Requirement.assignment)
+			& (AssignmentSubmission.member == member)
+		)
+		.select(Requirement.name)
+		.where(
+			(Requirement.parent == lesson)
+			& (Requirement.parenttype == "Course Lesson")
+			& QuizSubmission.name.isnull()
+			& AssignmentSubmission.name.isnull()
+		)
+		.limit(1)
+		.run()
+	)
+	return not pending
 
 
 @frappe.whitelist()
@@ -1,9 +1,133 @@
 # Copyright (c) 2021, FOSS United and Contributors
 # See license.txt
 
-# import frappe
 import unittest
 
+import frappe
+
+from lms.lms.doctype.course_lesson.course_lesson import (
+	flush_scorm_progress,
+	get_scorm_progress,
+	save_progress,
+)
+from lms.lms.doctype.lms_course.test_lms_course import new_course, new_user
+from lms.patches.v2_0.set_completed_lessons_in_enrollment import execute as set_completed_lessons
+
 
 class TestCourseLesson(unittest.TestCase):
-	pass
+	def setUp(self):
+		self.student = new_user("Lesson Student", "lesson_student@example.com")
+		self.course = new_course("Progress Course")
+
+		chapter = frappe.get_doc(
+			{"doctype": "Course Chapter", "course": self.course.name, "title": "Progress Chapter"}
+		).insert()
+		self.lessons = []
+		for i in range(1, 3):
+			lesson = frappe.get_doc(
+				{
+					"doctype": "Course Lesson",
+					"course": self.course.name,
+					"chapter": chapter.name,
+					"title": f"Progress Lesson {i}",
+				}
+			).insert()
+			chapter.append("lessons", {"lesson": lesson.name})
+			self.lessons.append(lesson.name)
+		chapter.save()
+
+		self.course.reload()
+		self.course.append("chapters", {"chapter": chapter.name})
+		self.course.save()
+
+		frappe.get_doc(
+			{"doctype": "LMS Enrollment", "course": self.course.name, "member": self.student.name}
+		).insert()
+		frappe.session.user = self.student.name
+
+	def get_enrollment(self):
+		return frappe.db.get_value(
+			"LMS Enrollment",
+			{"course": self.course.name, "member": self.student.name},
+			["progress", "completed_lessons", "current_lesson"],
+			as_dict=1,
+		)
+
+	def get_progress_rows(self, lesson):
+		return frappe.get_all(
+			"LMS Course Progress",
+			{"lesson": lesson, "member": self.student.name},
+			["status", "scorm_content"],
+		)
+
+	def test_complete_lesson(self):
+		self.assertEqual(save_progress(self.lessons[0], self.course.name), 50)
+
+		enrollment = self.get_enrollment()
+		self.assertEqual(enrollment.completed_lessons, 1)
+		self.assertEqual(enrollment.progress, 50)
+		self.assertEqual(enrollment.current_lesson, self.lessons[0])
+		self.assertEqual(len(self.get_progress_rows(self.lessons[0])), 1)
+
+		self.assertEqual(save_progress(self.lessons[1], self.course.name), 100)
+		self.assertEqual(self.get_enrollment().completed_lessons, 2)
+
+	def test_complete_lesson_twice(self):
+		save_progress(self.lessons[0], self.course.name)
+		self.assertEqual(save_progress(self.lessons[0], self.course.name), 50)
+
+		self.assertEqual(self.get_enrollment().completed_lessons, 1)
+		self.assertEqual(len(self.get_progress_rows(self.lessons[0])), 1)
+
+	def test_scorm_partial_to_complete(self):
+		lesson = self.lessons[0]
+		progress = save_progress(lesson, self.course.name, {"is_complete": False, "scorm_content": "state"})
+		self.assertEqual(progress, 0)
+		self.assertEqual(self.get_enrollment().completed_lessons, 0)
+
+		# the partial state is buffered until the scheduler flushes it
+		self.assertEqual(get_scorm_progress(lesson).scorm_content, "state")
+		self.assertEqual(self.get_progress_rows(lesson), [])
+
+		flush_scorm_progress()
+		rows = self.get_progress_rows(lesson)
+		self.assertEqual(len(rows), 1)
+		self.assertEqual(rows[0].status, "Partially Complete")
+		self.assertEqual(rows[0].scorm_content, "state")
+
+		progress = save_progress(lesson, self.course.name, {"is_complete": True, "scorm_content": "done"})
+		self.assertEqual(progress, 50)
+		self.assertEqual(self.get_progress_rows(lesson)[0].status, "Complete")
+		self.assertEqual(self.get_enrollment().completed_lessons, 1)
+
+		# a stale partial save flushed later does not undo the completion
+		save_progress(lesson, self.course.name, {"is_complete": False, "scorm_content": "stale"})
+		flush_scorm_progress()
+		self.assertEqual(self.get_progress_rows(lesson)[0].status, "Complete")
+
+	def test_completed_lessons_patch(self):
+		save_progress(self.lessons[0], self.course.name)
+		save_progress(self.lessons[1], self.course.name)
+		frappe.db.set_value(
+			"LMS Enrollment",
+			{"course": self.course.name, "member": self.student.name},
+			"completed_lessons",
+			0,
+		)
+
+		set_completed_lessons()
+		self.assertEqual(self.get_enrollment().completed_lessons, 2)
+
+	def tearDown(self):
+		frappe.session.user = "Administrator"
+		frappe.db.delete("LMS Course Progress", {"course": self.course.name})
+		frappe.db.delete("LMS Enrollment", {"course": self.course.name})
+		frappe.db.delete("Lesson Reference", {"lesson": ["in", self.lessons]})
+		frappe.db.delete("Course Lesson", {"course": self.course.name})
+		frappe.db.delete("Chapter Reference", {"parent": self.course.name})
+		frappe.db.delete("Course Chapter", {"course": self.course.name})
+		frappe.db.delete("Course Instructor", {"parent": self.course.name})
+		frappe.db.delete("LMS Daily Activity", {"member": self.student.name})
+		frappe.db.delete("LMS Streak", {"member": self.student.name})
+		frappe.delete_doc("LMS Course", self.course.name)
+		frappe.delete_doc("User", self.student.name)
@@ -1,9 +1,27 @@
 # Copyright (c) 2021, FOSS United and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
+from lms.lms.doctype.lms_enrollment.lms_enrollment import enqueue_course_progress_update
+from lms.lms.utils import clear_course_outline_cache, update_course_counter
+
 
 class LessonReference(Document):
-	pass
+	def after_insert(self):
+		course = self.get_course()
+		update_course_counter(course, "lessons", 1)
+		enqueue_course_progress_update(course)
+
+	def on_update(self):
+		clear_course_outline_cache(self.get_course())
+
+	def on_trash(self):
+		course = self.get_course()
+		clear_course_outline_cache(course)
+		update_course_counter(course, "lessons", -1)
+		enqueue_course_progress_update(course)
+
+	def get_course(self):
+		return frappe.db.get_value("Course Chapter", self.parent, "course")
@@ -8,7 +8,8 @@ from lms.lms.utils import has_course_instructor_role, has_moderator_role
 
 
 class LMSAssignment(Document):
-	pass
+	def on_trash(self):
+		frappe.db.delete("Lesson Requirement", {"assignment": self.name, "parenttype": "Course Lesson"})
 
 
 @frappe.whitelist()
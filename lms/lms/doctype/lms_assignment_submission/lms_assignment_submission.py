@@ -7,6 +7,8 @@ from frappe.desk.doctype.notification_log.notification_log import make_notificat
 from frappe.model.document import Document
 from frappe.utils import validate_url
 
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import record_activity
+
 
 class LMSAssignmentSubmission(Document):
 	def validate(self):
@@ -14,6 +16,9 @@ class LMSAssignmentSubmission(Document):
 		self.validate_url()
 		self.validate_status()
 
+	def after_insert(self):
+		record_activity(self.member, "assignment_submissions", self.creation)
+
 	def on_update(self):
 		self.validate_private_attachments()
 
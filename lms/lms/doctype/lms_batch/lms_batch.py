@@ -11,7 +11,9 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import add_days, cint, format_datetime, get_time, nowdate
 
+from lms.lms.reminders import send_reminders
 from lms.lms.utils import (
+	clear_batch_details_cache,
 	generate_slug,
 	get_assignment_details,
 	get_lesson_index,
@@ -34,6 +36,12 @@ class LMSBatch(Document):
 		self.validate_timetable()
 		self.validate_evaluation_end_date()
 
+	def on_update(self):
+		clear_batch_details_cache(self.name)
+
+	def on_trash(self):
+		clear_batch_details_cache(self.name)
+
 	def autoname(self):
 		if not self.name:
 			self.name = generate_slug(self.title, "LMS Batch")
@@ -83,12 +91,24 @@ class LMSBatch(Document):
 			frappe.throw(_("Evaluation end date cannot be less than the batch end date."))
 
 	def validate_membership(self):
+		courses = [row.course for row in self.courses]
 		members = frappe.get_all("LMS Batch Enrollment", {"batch": self.name}, pluck="member")
-		for course in self.courses:
+		if not courses or not members:
+			return
+
+		enrolled = {
+			(enrollment.course, enrollment.member)
+			for enrollment in frappe.get_all(
+				"LMS Enrollment",
+				{"course": ["in", courses], "member": ["in", members]},
+				["course", "member"],
+			)
+		}
+		for course in courses:
 			for member in members:
-				if not frappe.db.exists("LMS Enrollment", {"course": course.course, "member": member}):
+				if (course, member) not in enrolled:
 					enrollment = frappe.new_doc("LMS Enrollment")
-					enrollment.course = course.course
+					enrollment.course = course
 					enrollment.member = member
 					enrollment.save()
 
@@ -96,8 +116,14 @@ class LMSBatch(Document):
 		if cint(self.seat_count) < 0:
 			frappe.throw(_("Seat count cannot be negative."))
 
-		students = frappe.db.count("LMS Batch Enrollment", {"batch": self.name})
-		if cint(self.seat_count) and cint(self.seat_count) < students:
+		# The counter is maintained by the seat ledger, never trust the value loaded in the form
+		self.reserved_seats = 0
+		if not self.is_new():
+			self.reserved_seats = frappe.db.get_value(
+				"LMS Batch", self.name, "reserved_seats", for_update=True
+			)
+
+		if cint(self.seat_count) and cint(self.seat_count) < cint(self.reserved_seats):
 			frappe.throw(_("There are no seats available in this batch."))
 
 	def validate_timetable(self):
@@ -263,7 +289,7 @@ def get_timetable_details(timetable):
 
 		if entry.reference_doctype == "Course Lesson":
 			course = frappe.db.get_value(entry.reference_doctype, entry.reference_docname, "course")
-			entry.url = get_lesson_url(course, get_lesson_index(entry.reference_docname))
+			entry.url = get_lesson_url(course, get_lesson_index(entry.reference_docname, course))
 
 			entry.completed = (
 				True
@@ -299,28 +325,24 @@ def send_batch_start_reminder():
 	)
 
 	for batch in batches:
-		students = frappe.get_all("LMS Batch Enrollment", {"batch": batch.name}, ["member", "member_name"])
-		for student in students:
-			send_mail(batch, student)
-
-
-def send_mail(batch, student):
-	subject = _("Your batch {0} is starting tomorrow").format(batch.title)
-	template = "batch_start_reminder"
-
-	args = {
-		"student_name": student.member_name,
-		"title": batch.title,
-		"start_date": batch.start_date,
-		"start_time": batch.start_time,
-		"medium": batch.medium,
-		"name": batch.name,
-	}
-
-	frappe.sendmail(
-		recipients=student.member,
-		subject=subject,
-		template=template,
-		args=args,
-		header=[_(f"Batch Start Reminder: {batch.title}"), "orange"],
-	)
+		students = frappe.get_all(
+			"LMS Batch Enrollment",
+			{"batch": batch.name},
+			["member as email", "member_name as student_name"],
+		)
+		send_reminders(
+			"batch_start_reminder",
+			"LMS Batch",
+			batch.name,
+			students,
+			subject=_("Your batch {0} is starting tomorrow").format(batch.title),
+			template="batch_start_reminder",
+			args={
+				"title": batch.title,
+				"start_date": batch.start_date,
+				"start_time": batch.start_time,
+				"medium": batch.medium,
+				"name": batch.name,
+			},
+			header=[_(f"Batch Start Reminder: {batch.title}"), "orange"],
+		)
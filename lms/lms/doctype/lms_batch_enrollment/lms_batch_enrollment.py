@@ -8,16 +8,23 @@ from frappe import _
 from frappe.email.doctype.email_template.email_template import get_email_template
 from frappe.model.document import Document
 
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import release_seats, reserve_seat_for_member
+from lms.lms.utils import clear_batch_details_cache
+
 
 class LMSBatchEnrollment(Document):
 	def after_insert(self):
+		clear_batch_details_cache(self.batch)
 		send_confirmation_email(self)
 		self.add_member_to_live_class()
 
+	def on_trash(self):
+		release_seats(self.batch)
+
 	def validate(self):
 		self.validate_owner()
 		self.validate_duplicate_members()
-		self.validate_seat_availability()
+		self.reserve_seat()
 		self.validate_course_enrollment()
 
 	def validate_owner(self):
@@ -35,11 +42,9 @@ class LMSBatchEnrollment(Document):
 		):
 			frappe.throw(_("Member already enrolled in this batch"))
 
-	def validate_seat_availability(self):
-		seat_count = frappe.db.get_value("LMS Batch", self.batch, "seat_count")
-		enrolled_count = frappe.db.count("LMS Batch Enrollment", {"batch": self.batch})
-		if seat_count and enrolled_count >= seat_count:
-			frappe.throw(_("There are no seats available in this batch."))
+	def reserve_seat(self):
+		if self.is_new():
+			reserve_seat_for_member(self.batch, self.member)
 
 	def validate_course_enrollment(self):
 		courses = frappe.get_all("Batch Course", filters={"parent": self.batch}, fields=["course"])
@@ -86,20 +91,8 @@ def send_confirmation_email(doc):
 			frappe.db.set_value(doc.doctype, doc.name, "confirmation_email_sent", 1)
 
 
-def send_mail(doc):
-	batch = frappe.db.get_value(
-		"LMS Batch",
-		doc.batch,
-		[
-			"name",
-			"title",
-			"start_date",
-			"start_time",
-			"medium",
-			"confirmation_email_template",
-		],
-		as_dict=1,
-	)
+def send_mail(doc, batch=None):
+	batch = batch or get_batch_email_details(doc.batch)
 
 	subject = _("Enrollment Confirmation for {0}").format(batch.title)
 	template = "batch_confirmation"
@@ -130,3 +123,19 @@ def send_mail(doc):
 		header=[_(batch.title), "green"],
 		retry=3,
 	)
+
+
+def get_batch_email_details(batch):
+	return frappe.db.get_value(
+		"LMS Batch",
+		batch,
+		[
+			"name",
+			"title",
+			"start_date",
+			"start_time",
+			"medium",
+			"confirmation_email_template",
+		],
+		as_dict=1,
+	)
@@ -9,7 +9,7 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import cint, today
 
-from ...utils import generate_slug, update_payment_record, validate_image
+from ...utils import clear_course_outline_cache, generate_slug, update_payment_record, validate_image
 
 
 class LMSCourse(Document):
@@ -95,6 +95,7 @@ class LMSCourse(Document):
 			self.card_gradient = random.choice(colors)
 
 	def on_update(self):
+		clear_course_outline_cache(self.name)
 		if not self.upcoming and self.has_value_changed("upcoming"):
 			self.send_email_to_interested_users()
 
@@ -4,13 +4,26 @@
 import frappe
 from frappe.model.document import Document
 
-from lms.lms.doctype.lms_enrollment.lms_enrollment import update_program_progress
-from lms.lms.utils import get_course_progress
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import record_activity
+from lms.lms.doctype.lms_enrollment.lms_enrollment import (
+	get_completed_lesson_counts,
+	update_program_progress,
+)
+from lms.lms.utils import get_lesson_sequence, get_progress_percentage
 
 
 class LMSCourseProgress(Document):
+	def after_insert(self):
+		record_activity(self.member, "lesson_progress", self.creation)
+		if self.status == "Complete":
+			record_activity(self.member, "lesson_completions", self.creation)
+
 	def after_delete(self):
-		progress = get_course_progress(self.course, self.member)
+		lessons = [lesson.name for lesson in get_lesson_sequence(self.course).lessons]
+		completed_lessons = get_completed_lesson_counts(self.course, [self.member], lessons).get(
+			self.member, 0
+		)
+		progress = get_progress_percentage(completed_lessons, len(lessons))
 		membership = frappe.db.get_value(
 			"LMS Enrollment",
 			{
@@ -19,5 +32,9 @@ class LMSCourseProgress(Document):
 			},
 			"name",
 		)
-		frappe.db.set_value("LMS Enrollment", membership, "progress", progress)
+		frappe.db.set_value(
+			"LMS Enrollment",
+			membership,
+			{"progress": progress, "completed_lessons": completed_lessons},
+		)
 		update_program_progress(self.member)
@@ -6,12 +6,21 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from lms.lms.utils import update_course_rating
+
 
 class LMSCourseReview(Document):
 	def validate(self):
 		self.validate_enrollment()
 		self.validate_if_already_reviewed()
 
+	def on_update(self):
+		if self.has_value_changed("rating"):
+			update_course_rating(self.course)
+
+	def after_delete(self):
+		update_course_rating(self.course)
+
 	def validate_enrollment(self):
 		enrollment = frappe.db.exists("LMS Enrollment", {"course": self.course, "member": self.owner})
 		if not enrollment:
@@ -0,0 +1,112 @@
+# Copyright (c) 2026, Frappe and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Count, Date
+from frappe.utils import add_days, getdate, now, today
+
+from lms.lms.doctype.lms_streak.lms_streak import update_streak
+
+# Rollup field -> (doctype, filters, date field) of the rows counted in it.
+# Completed progress rows are not updated after completion, so their modified
+# date is the day the lesson was completed, even for SCORM lessons.
+ACTIVITY_SOURCES = {
+	"lesson_progress": ("LMS Course Progress", {}, "creation"),
+	"lesson_completions": ("LMS Course Progress", {"status": "Complete"}, "modified"),
+	"quiz_submissions": ("LMS Quiz Submission", {}, "creation"),
+	"assignment_submissions": ("LMS Assignment Submission", {}, "creation"),
+	"programming_exercise_submissions": ("LMS Programming Exercise Submission", {}, "creation"),
+}
+
+
+class LMSDailyActivity(Document):
+	def autoname(self):
+		self.name = get_activity_name(self.member, self.date)
+
+
+def get_activity_name(member, date):
+	return f"{member}-{getdate(date)}"
+
+
+def record_activity(member, field, date=None):
+	"""Counts one activity of the member in the rollup of the day."""
+	if not member or member == "Guest":
+		return
+
+	date = getdate(date)
+	name = get_activity_name(member, date)
+
+	if not frappe.db.exists("LMS Daily Activity", name):
+		try:
+			frappe.get_doc(
+				{"doctype": "LMS Daily Activity", "member": member, "date": date, field: 1}
+			).insert(ignore_permissions=True)
+			update_streak(member, date)
+			return
+		except frappe.DuplicateEntryError:
+			pass
+
+	Activity = frappe.qb.DocType("LMS Daily Activity")
+	frappe.qb.update(Activity).set(Activity[field], Activity[field] + 1).where(Activity.name == name).run()
+
+
+def rebuild_daily_activity(since=None, member=None):
+	"""Rebuilds the rollup from the activity doctypes, for all days or the days from `since`.
+
+	Only the days before today are rebuilt, today's rows are still being
+	counted by `record_activity` and would lose the updates made meanwhile."""
+	until = getdate(today())
+	activity = {}
+	for field, (doctype, filters, date_field) in ACTIVITY_SOURCES.items():
+		for row in get_daily_counts(doctype, filters, date_field, since, until, member):
+			activity.setdefault((row.member, getdate(row.date)), {})[field] = row.count
+
+	Activity = frappe.qb.DocType("LMS Daily Activity")
+	query = frappe.qb.from_(Activity).delete().where(Activity.date < until)
+	if since:
+		query = query.where(Activity.date >= getdate(since))
+	if member:
+		query = query.where(Activity.member == member)
+	query.run()
+
+	fields = ["name", "member", "date", *ACTIVITY_SOURCES, "owner", "modified_by", "creation", "modified"]
+	timestamp = now()
+	values = [
+		(
+			get_activity_name(activity_member, date),
+			activity_member,
+			date,
+			*(counts.get(field, 0) for field in ACTIVITY_SOURCES),
+			"Administrator",
+			"Administrator",
+			timestamp,
+			timestamp,
+		)
+		for (activity_member, date), counts in activity.items()
+	]
+	frappe.db.bulk_insert("LMS Daily Activity", fields, values)
+
+
+def get_daily_counts(doctype, filters, date_field, since, until, member=None):
+	Table = frappe.qb.DocType(doctype)
+	date = Table[date_field]
+	query = (
+		frappe.qb.from_(Table)
+		.select(Table.member, Date(date).as_("date"), Count(Table.name).as_("count"))
+		.where(Table.member.isnotnull() & (date < getdate(until)))
+		.groupby(Table.member, Date(date))
+	)
+	for fieldname, value in filters.items():
+		query = query.where(Table[fieldname] == value)
+	if since:
+		query = query.where(date >= getdate(since))
+	if member:
+		query = query.where(Table.member == member)
+
+	return query.run(as_dict=True)
+
+
+def rebuild_recent_daily_activity():
+	"""Nightly reconciliation of the rollup for yesterday, the day that just closed."""
+	rebuild_daily_activity(since=add_days(today(), -1))
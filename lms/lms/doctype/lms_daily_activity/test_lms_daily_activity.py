@@ -0,0 +1,114 @@
+# Copyright (c) 2026, Frappe and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_days, getdate, today
+
+from lms.lms.doctype.lms_course.test_lms_course import new_user
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import (
+	get_activity_name,
+	rebuild_daily_activity,
+	record_activity,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestLMSDailyActivity(UnitTestCase):
+	"""
+	Unit tests for LMSDailyActivity.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestLMSDailyActivity(IntegrationTestCase):
+	"""
+	Integration tests for LMSDailyActivity.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.member = new_user("Activity Student", "activity_student@example.com").name
+		self.two_days_ago = getdate(add_days(today(), -2))
+		self.yesterday = getdate(add_days(today(), -1))
+
+	def get_activity(self, date):
+		return frappe.db.get_value(
+			"LMS Daily Activity",
+			get_activity_name(self.member, date),
+			["lesson_progress", "lesson_completions", "quiz_submissions"],
+			as_dict=1,
+		)
+
+	def insert_source_rows(self, doctype, rows):
+		"""Inserts rows of an activity doctype with the given dates, without triggering the rollup."""
+		fields = ["name", "member", *rows[0].keys()]
+		frappe.db.bulk_insert(
+			doctype,
+			fields,
+			[(frappe.generate_hash(length=10), self.member, *row.values()) for row in rows],
+		)
+
+	def test_one_row_per_member_and_day(self):
+		record_activity(self.member, "quiz_submissions", self.yesterday)
+		record_activity(self.member, "quiz_submissions", self.yesterday)
+		record_activity(self.member, "lesson_progress", self.yesterday)
+		record_activity(self.member, "lesson_progress", self.two_days_ago)
+
+		self.assertEqual(frappe.db.count("LMS Daily Activity", {"member": self.member}), 2)
+		activity = self.get_activity(self.yesterday)
+		self.assertEqual(activity.quiz_submissions, 2)
+		self.assertEqual(activity.lesson_progress, 1)
+		self.assertEqual(self.get_activity(self.two_days_ago).lesson_progress, 1)
+
+	def test_rebuild_counts_per_source(self):
+		started = f"{self.two_days_ago} 10:00:00"
+		completed = f"{self.yesterday} 10:00:00"
+		self.insert_source_rows(
+			"LMS Course Progress",
+			[
+				{"status": "Complete", "creation": started, "modified": started},
+				# a SCORM lesson started two days ago and completed yesterday
+				{"status": "Complete", "creation": started, "modified": completed},
+				{"status": "Partially Complete", "creation": completed, "modified": completed},
+			],
+		)
+		self.insert_source_rows(
+			"LMS Quiz Submission",
+			[{"creation": started, "modified": started}, {"creation": started, "modified": started}],
+		)
+
+		rebuild_daily_activity(since=self.two_days_ago, member=self.member)
+
+		activity = self.get_activity(self.two_days_ago)
+		self.assertEqual(activity.lesson_progress, 2)
+		self.assertEqual(activity.lesson_completions, 1)
+		self.assertEqual(activity.quiz_submissions, 2)
+
+		activity = self.get_activity(self.yesterday)
+		self.assertEqual(activity.lesson_progress, 1)
+		self.assertEqual(activity.lesson_completions, 1)
+		self.assertEqual(activity.quiz_submissions, 0)
+
+	def test_rebuild_leaves_today_alone(self):
+		record_activity(self.member, "quiz_submissions")
+		record_activity(self.member, "quiz_submissions", self.yesterday)
+
+		# neither row has source rows, only the closed day is rebuilt from them
+		rebuild_daily_activity(member=self.member)
+
+		self.assertEqual(self.get_activity(today()).quiz_submissions, 1)
+		self.assertIsNone(self.get_activity(self.yesterday))
+
+	def tearDown(self):
+		frappe.db.delete("LMS Course Progress", {"member": self.member})
+		frappe.db.delete("LMS Quiz Submission", {"member": self.member})
+		frappe.db.delete("LMS Daily Activity", {"member": self.member})
+		frappe.db.delete("LMS Streak", {"member": self.member})
@@ -4,16 +4,49 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import ceil
+from frappe.query_builder.functions import Coalesce, Count, Sum
+from frappe.utils import ceil, cint, flt
+
+from lms.lms.utils import (
+	get_lesson_sequence,
+	get_lessons,
+	get_progress_percentage,
+	update_course_counter,
+)
 
 
 class LMSEnrollment(Document):
 	def validate(self):
 		self.validate_course_enrollment_eligibility()
 
+	def after_insert(self):
+		if self.member_type == "Student":
+			update_course_counter(self.course, "enrollments", 1)
+
 	def on_update(self):
+		self.update_enrollment_counter()
 		update_program_progress(self.member)
 
+	def on_trash(self):
+		if self.member_type == "Student":
+			update_course_counter(self.course, "enrollments", -1)
+
+	def update_enrollment_counter(self):
+		"""Moves the enrollment between the counters when its course or member type changes."""
+		doc_before_save = self.get_doc_before_save()
+		if not doc_before_save:
+			return
+
+		was_student = doc_before_save.member_type == "Student"
+		is_student = self.member_type == "Student"
+		if doc_before_save.course == self.course and was_student == is_student:
+			return
+
+		if was_student:
+			update_course_counter(doc_before_save.course, "enrollments", -1)
+		if is_student:
+			update_course_counter(self.course, "enrollments", 1)
+
 	def validate_course_enrollment_eligibility(self):
 		course_details = frappe.db.get_value(
 			"LMS Course",
@@ -48,18 +81,169 @@ class LMSEnrollment(Document):
 
 
 def update_program_progress(member):
-	programs = frappe.get_all("LMS Program Member", {"member": member}, ["parent", "name"])
-
-	for program in programs:
-		total_progress = 0
-		courses = frappe.get_all("LMS Program Course", {"parent": program.parent}, pluck="course")
-		for course in courses:
-			progress = frappe.db.get_value("LMS Enrollment", {"course": course, "member": member}, "progress")
-			progress = progress or 0
-			total_progress += progress
-
-		average_progress = ceil(total_progress / len(courses))
-		frappe.db.set_value("LMS Program Member", program.name, "progress", average_progress)
+	"""Recomputes the progress of the member in all their programs."""
+	ProgramMember = frappe.qb.DocType("LMS Program Member")
+	set_program_member_progress(ProgramMember.member == member)
+
+
+def update_program_members_progress(program, members=None):
+	"""Recomputes the progress of all the members of the program, or only of
+	the given members."""
+	ProgramMember = frappe.qb.DocType("LMS Program Member")
+	condition = ProgramMember.parent == program
+	if members:
+		condition &= ProgramMember.member.isin(members)
+
+	set_program_member_progress(condition)
+
+
+def set_program_member_progress(condition):
+	"""Computes the progress of the matching program members as the average
+	progress of the program courses with one aggregate query and writes back
+	only the rows that changed. Programs without courses get 0."""
+	ProgramMember = frappe.qb.DocType("LMS Program Member")
+	ProgramCourse = frappe.qb.DocType("LMS Program Course")
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
+
+	rows = (
+		frappe.qb.from_(ProgramMember)
+		.left_join(ProgramCourse)
+		.on((ProgramCourse.parent == ProgramMember.parent) & (ProgramCourse.parenttype == "LMS Program"))
+		.left_join(Enrollment)
+		.on((Enrollment.member == ProgramMember.member) & (Enrollment.course == ProgramCourse.course))
+		.select(
+			ProgramMember.name,
+			ProgramMember.progress,
+			Count(ProgramCourse.name).distinct().as_("course_count"),
+			Sum(Coalesce(Enrollment.progress, 0)).as_("total_progress"),
+		)
+		.where((ProgramMember.parenttype == "LMS Program") & condition)
+		.groupby(ProgramMember.name, ProgramMember.progress)
+		.run(as_dict=True)
+	)
+
+	updates = {}
+	for row in rows:
+		progress = ceil(flt(row.total_progress) / row.course_count) if row.course_count else 0
+		if cint(row.progress) != progress:
+			updates[row.name] = {"progress": progress}
+
+	if updates:
+		frappe.db.bulk_update("LMS Program Member", updates, update_modified=False)
+
+
+def enqueue_course_progress_update(course):
+	"""Queues a recompute of the progress of all the enrollments of the course.
+
+	Repeated calls for the same course are merged into one job. A call made
+	while the job is running is not queued, so it marks the course as changed
+	and the running job starts over once it is done."""
+	if not course:
+		return
+
+	job_id = get_course_progress_job_id(course)
+	frappe.db.after_commit.add(lambda: frappe.cache().set_value(job_id, 1))
+	frappe.enqueue(
+		"lms.lms.doctype.lms_enrollment.lms_enrollment.update_course_progress",
+		queue="long",
+		timeout=3600,
+		job_id=job_id,
+		deduplicate=True,
+		enqueue_after_commit=True,
+		course=course,
+	)
+
+
+def get_course_progress_job_id(course):
+	return f"update_course_progress::{course}"
+
+
+def update_course_progress(course, chunk_size=1000):
+	"""Recomputes the progress of all the enrollments of the course, again
+	if the outline changed while it was running."""
+	changed = get_course_progress_job_id(course)
+	while True:
+		frappe.cache().delete_value(changed)
+		recompute_course_progress(course, chunk_size)
+		if not frappe.cache().get_value(changed):
+			break
+
+
+def recompute_course_progress(course, chunk_size):
+	"""Enrollments are processed in chunks with one aggregate query each and
+	every chunk is committed, so that large courses don't hold locks for long."""
+	# Start a new transaction, so that the outline is read as it is now
+	frappe.db.commit()
+	lessons = [lesson.name for lesson in get_lesson_sequence(course).lessons]
+	lesson_count = get_lessons(course, get_details=False)
+	programs = frappe.get_all(
+		"LMS Program Course", {"course": course, "parenttype": "LMS Program"}, pluck="parent"
+	)
+	total = frappe.db.count("LMS Enrollment", {"course": course})
+	processed = 0
+	last_enrollment = ""
+
+	while True:
+		enrollments = frappe.get_all(
+			"LMS Enrollment",
+			filters={"course": course, "name": [">", last_enrollment]},
+			fields=["name", "member", "progress", "completed_lessons"],
+			order_by="name asc",
+			limit=chunk_size,
+		)
+		if not enrollments:
+			break
+
+		members = [enrollment.member for enrollment in enrollments]
+		completed = get_completed_lesson_counts(course, members, lessons)
+
+		updates = {}
+		for enrollment in enrollments:
+			completed_lessons = completed.get(enrollment.member, 0)
+			progress = get_progress_percentage(completed_lessons, lesson_count)
+			if (
+				flt(enrollment.progress) != progress
+				or cint(enrollment.completed_lessons) != completed_lessons
+			):
+				updates[enrollment.name] = {"progress": progress, "completed_lessons": completed_lessons}
+
+		if updates:
+			frappe.db.bulk_update("LMS Enrollment", updates, update_modified=False)
+
+		for program in programs:
+			update_program_members_progress(program, members)
+
+		frappe.db.commit()
+
+		processed += len(enrollments)
+		last_enrollment = enrollments[-1].name
+		frappe.publish_progress(
+			processed * 100 / (total or processed),
+			title=_("Updating Course Progress"),
+			doctype="LMS Course",
+			docname=course,
+			description=_("{0} of {1} enrollments updated").format(processed, total),
+		)
+
+
+def get_completed_lesson_counts(course, members, lessons):
+	if not lessons:
+		return {}
+
+	Progress = frappe.qb.DocType("LMS Course Progress")
+	rows = (
+		frappe.qb.from_(Progress)
+		.select(Progress.member, Count(Progress.name).as_("count"))
+		.where(
+			(Progress.course == course)
+			& (Progress.member.isin(members))
+			& (Progress.lesson.isin(lessons))
+			& (Progress.status == "Complete")
+		)
+		.groupby(Progress.member)
+		.run(as_dict=True)
+	)
+	return {row.member: row.count for row in rows}
 
 
 @frappe.whitelist()
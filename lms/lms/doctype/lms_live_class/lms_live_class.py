@@ -11,6 +11,7 @@ from frappe.model.document import Document
 from frappe.utils import cint, format_date, format_time, get_datetime, nowdate
 
 from lms.lms.doctype.lms_batch.lms_batch import authenticate
+from lms.lms.reminders import send_reminders
 
 
 class LMSLiveClass(Document):
@@ -85,31 +86,23 @@ def send_live_class_reminder():
 		students = frappe.get_all(
 			"LMS Batch Enrollment",
 			{"batch": live_class.batch_name},
-			["member", "member_name"],
+			["member as email", "member_name as student_name"],
+		)
+		send_reminders(
+			"live_class_reminder",
+			"LMS Live Class",
+			live_class.name,
+			students,
+			subject=_("Your class on {0} is today").format(live_class.title),
+			template="live_class_reminder",
+			args={
+				"title": live_class.title,
+				"date": live_class.date,
+				"time": live_class.time,
+				"batch_name": live_class.batch_name,
+			},
+			header=[_(f"Class Reminder: {live_class.title}"), "orange"],
 		)
-		for student in students:
-			send_mail(live_class, student)
-
-
-def send_mail(live_class, student):
-	subject = _("Your class on {0} is today").format(live_class.title)
-	template = "live_class_reminder"
-
-	args = {
-		"student_name": student.member_name,
-		"title": live_class.title,
-		"date": live_class.date,
-		"time": live_class.time,
-		"batch_name": live_class.batch_name,
-	}
-
-	frappe.sendmail(
-		recipients=student.member,
-		subject=subject,
-		template=template,
-		args=args,
-		header=[_(f"Class Reminder: {live_class.title}"), "orange"],
-	)
 
 
 def update_attendance():
@@ -3,10 +3,12 @@
 
 import frappe
 from frappe import _
-from frappe.email.doctype.email_template.email_template import get_email_template
 from frappe.model.document import Document
 from frappe.utils import add_days, flt, nowdate
 
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import has_available_seat
+from lms.lms.reminders import send_reminders
+
 
 class LMSPayment(Document):
 	pass
@@ -32,74 +34,93 @@ def send_payment_reminder():
 		],
 	)
 
+	paid = get_paid_documents(incomplete_payments)
+	reminders = {}
 	for payment in incomplete_payments:
-		if has_paid_later(payment):
+		document = (payment.payment_for_document_type, payment.payment_for_document)
+		if (payment.member, *document) in paid:
 			continue
 
 		if is_batch_sold_out(payment):
 			continue
 
-		send_mail(payment)
+		reminders.setdefault(document, {})[payment.member] = frappe._dict(
+			{"email": payment.member, "billing_name": payment.billing_name}
+		)
+
+	if reminders:
+		send_mail(reminders)
 
 
-def has_paid_later(payment):
-	return frappe.db.exists(
+def get_paid_documents(payments):
+	"""Returns the (member, doctype, document) of the payments that were received for the same document."""
+	if not payments:
+		return set()
+
+	paid = frappe.get_all(
 		"LMS Payment",
 		{
-			"member": payment.member,
 			"payment_received": 1,
-			"payment_for_document": payment.payment_for_document,
-			"payment_for_document_type": payment.payment_for_document_type,
+			"member": ["in", list({payment.member for payment in payments})],
+			"payment_for_document": ["in", list({payment.payment_for_document for payment in payments})],
 		},
+		["member", "payment_for_document_type", "payment_for_document"],
 	)
+	return {(row.member, row.payment_for_document_type, row.payment_for_document) for row in paid}
 
 
 def is_batch_sold_out(payment):
 	if payment.payment_for_document_type == "LMS Batch":
-		seat_count = frappe.get_cached_value("LMS Batch", payment.payment_for_document, "seat_count")
-		number_of_students = frappe.db.count("LMS Batch Enrollment", {"batch": payment.payment_for_document})
-
-		if seat_count <= number_of_students:
-			return True
+		return not has_available_seat(payment.payment_for_document, payment.member)
 
 	return False
 
 
-def send_mail(payment):
-	subject = _("Complete Your Enrollment - Don't miss out!")
-	template = "payment_reminder"
+def send_mail(reminders):
+	"""Sends one reminder per course or batch to all the members with an incomplete payment for it."""
 	custom_template = frappe.db.get_single_value("LMS Settings", "payment_reminder_template")
-
-	args = {
-		"billing_name": payment.billing_name,
-		"type": payment.payment_for_document_type.split(" ")[-1].lower(),
-		"title": frappe.db.get_value(
-			payment.payment_for_document_type, payment.payment_for_document, "title"
-		),
-		"link": f"/lms/billing/{ payment.payment_for_document_type.split(' ')[-1].lower() }/{ payment.payment_for_document }",
-	}
-
-	if custom_template:
-		email_template = get_email_template(custom_template, args)
-		subject = email_template.get("subject")
-		content = email_template.get("message")
-
-	instructors = frappe.get_all(
+	titles = get_document_titles(reminders)
+	instructors = get_document_instructors(reminders)
+
+	for (doctype, docname), recipients in reminders.items():
+		module = doctype.split(" ")[-1].lower()
+		send_reminders(
+			"payment_reminder",
+			doctype,
+			docname,
+			list(recipients.values()),
+			subject=_("Complete Your Enrollment - Don't miss out!"),
+			template="payment_reminder",
+			custom_template=custom_template,
+			args={
+				"type": module,
+				"title": titles.get((doctype, docname)),
+				"link": f"/lms/billing/{module}/{docname}",
+			},
+			cc=instructors.get((doctype, docname)),
+			retry=3,
+		)
+
+
+def get_document_titles(documents):
+	titles = {}
+	for doctype in {doctype for doctype, _docname in documents}:
+		names = [docname for document_type, docname in documents if document_type == doctype]
+		for row in frappe.get_all(doctype, {"name": ["in", names]}, ["name", "title"]):
+			titles[(doctype, row.name)] = row.title
+	return titles
+
+
+def get_document_instructors(documents):
+	instructors = {}
+	rows = frappe.get_all(
 		"Course Instructor",
 		{
-			"parenttype": payment.payment_for_document_type,
-			"parent": payment.payment_for_document,
+			"parenttype": ["in", list({doctype for doctype, _docname in documents})],
+			"parent": ["in", list({docname for _doctype, docname in documents})],
 		},
-		pluck="instructor",
-	)
-
-	frappe.sendmail(
-		recipients=payment.member,
-		cc=instructors,
-		subject=subject,
-		template=template if not custom_template else None,
-		content=content if custom_template else None,
-		args=args,
-		header=[subject, "green"],
-		retry=3,
+		["parenttype", "parent", "instructor"],
 	)
+	for row in rows:
+		instructors.setdefault((row.parenttype, row.parent), []).append(row.instructor)
+	return instructors
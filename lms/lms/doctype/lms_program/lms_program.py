@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from lms.lms.doctype.lms_enrollment.lms_enrollment import update_program_members_progress
+
 
 class LMSProgram(Document):
 	def validate(self):
@@ -12,6 +14,9 @@ class LMSProgram(Document):
 		self.validate_program_members()
 		self.update_count()
 
+	def on_update(self):
+		self.update_progress()
+
 	def validate_program_courses(self):
 		courses = [row.course for row in self.program_courses]
 		duplicates = {course for course in courses if courses.count(course) > 1}
@@ -41,3 +46,17 @@ class LMSProgram(Document):
 
 		if self.member_count != member_count:
 			self.member_count = member_count
+
+	def update_progress(self):
+		"""Recompute the progress of all members if the courses or members have changed"""
+		doc_before_save = self.get_doc_before_save()
+		if doc_before_save and get_courses_and_members(doc_before_save) == get_courses_and_members(self):
+			return
+
+		update_program_members_progress(self.name)
+
+
+def get_courses_and_members(program):
+	courses = {row.course for row in program.program_courses}
+	members = {row.member for row in program.program_members}
+	return courses, members
@@ -1,9 +1,11 @@
 # Copyright (c) 2025, Frappe and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import record_activity
+
 
 class LMSProgrammingExerciseSubmission(Document):
-	pass
+	def after_insert(self):
+		record_activity(self.member, "programming_exercise_submissions", self.creation)
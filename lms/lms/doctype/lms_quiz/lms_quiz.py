@@ -29,6 +29,18 @@ class LMSQuiz(Document):
 		self.validate_open_ended_questions()
 		self.validate_availability_window()
 
+	def on_update(self):
+		if self.has_value_changed("passing_percentage"):
+			frappe.db.set_value(
+				"Lesson Requirement",
+				{"quiz": self.name, "parenttype": "Course Lesson"},
+				"passing_percentage",
+				self.passing_percentage,
+			)
+
+	def on_trash(self):
+		frappe.db.delete("Lesson Requirement", {"quiz": self.name, "parenttype": "Course Lesson"})
+
 	def validate_duplicate_questions(self):
 		questions = [row.question for row in self.questions]
 		rows = [i + 1 for i, x in enumerate(questions) if questions.count(x) > 1]
@@ -7,6 +7,8 @@ from frappe.desk.doctype.notification_log.notification_log import make_notificat
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import record_activity
+
 
 class LMSQuizSubmission(Document):
 	def validate(self):
@@ -14,6 +16,9 @@ class LMSQuizSubmission(Document):
 		self.validate_marks()
 		self.set_percentage()
 
+	def after_insert(self):
+		record_activity(self.member, "quiz_submissions", self.creation)
+
 	def on_update(self):
 		self.notify_member()
 
@@ -0,0 +1,151 @@
+# Copyright (c) 2026, Frappe and contributors
+# For license information, please see license.txt
+
+from collections import Counter
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_to_date, cint, now_datetime
+
+from lms.lms.utils import clear_batch_details_cache
+
+SEAT_HOLD_MINUTES = 30
+
+
+class LMSSeatHold(Document):
+	pass
+
+
+def reserve_seats(batch, count=1):
+	"""Takes seats of the batch or throws if it does not have enough seats left.
+
+	The batch row stays locked till the end of the transaction, so concurrent
+	reservations for the same batch are serialized instead of overbooking it."""
+	seat_count, reserved_seats = frappe.db.get_value(
+		"LMS Batch", batch, ["seat_count", "reserved_seats"], for_update=True
+	)
+	if cint(seat_count) and cint(reserved_seats) + count > cint(seat_count):
+		frappe.throw(_("There are no seats available in this batch."))
+
+	update_reserved_seats(batch, count)
+
+
+def release_seats(batch, count=1):
+	update_reserved_seats(batch, -count)
+
+
+def update_reserved_seats(batch, delta):
+	Batch = frappe.qb.DocType("LMS Batch")
+	(
+		frappe.qb.update(Batch)
+		.set(Batch.reserved_seats, Batch.reserved_seats + delta)
+		.where((Batch.name == batch) & (Batch.reserved_seats + delta >= 0))
+		.run()
+	)
+	clear_batch_details_cache(batch)
+
+
+def reserve_seat_for_member(batch, member):
+	"""Reserves a seat for a new student, using up the seat held for their payment if any."""
+	if not convert_seat_hold(batch, member):
+		reserve_seats(batch)
+
+
+def hold_seat(batch, member, payment=None):
+	"""Holds a seat of the batch while the payment of the member is in progress.
+
+	An active hold of the member is extended instead of taking another seat."""
+	expires_on = add_to_date(now_datetime(), minutes=SEAT_HOLD_MINUTES)
+	hold = get_active_hold(batch, member)
+	if hold:
+		frappe.db.set_value("LMS Seat Hold", hold, {"expires_on": expires_on, "payment": payment})
+		return hold
+
+	reserve_seats(batch)
+	hold = frappe.get_doc(
+		{
+			"doctype": "LMS Seat Hold",
+			"batch": batch,
+			"member": member,
+			"payment": payment,
+			"expires_on": expires_on,
+		}
+	)
+	hold.insert(ignore_permissions=True)
+	return hold.name
+
+
+def convert_seat_hold(batch, member):
+	"""Marks the active hold of the member as converted into an enrollment.
+	Returns False if the member has no seat held."""
+	hold = get_active_hold(batch, member)
+	if not hold:
+		return False
+
+	frappe.db.set_value("LMS Seat Hold", hold, "status", "Converted")
+	return True
+
+
+def get_active_hold(batch, member):
+	return frappe.db.get_value(
+		"LMS Seat Hold", {"batch": batch, "member": member, "status": "Active"}, "name", for_update=True
+	)
+
+
+def has_available_seat(batch, member=None):
+	"""Checks the seat counter of the batch, counting the seat held for the member as available."""
+	seat_count, reserved_seats = frappe.db.get_value("LMS Batch", batch, ["seat_count", "reserved_seats"])
+	if not cint(seat_count) or cint(reserved_seats) < cint(seat_count):
+		return True
+
+	return bool(
+		member and frappe.db.exists("LMS Seat Hold", {"batch": batch, "member": member, "status": "Active"})
+	)
+
+
+def expire_seat_holds():
+	"""Releases the seats held for payments that were not completed in time."""
+	holds = frappe.get_all(
+		"LMS Seat Hold",
+		{"status": "Active", "expires_on": ["<", now_datetime()]},
+		["name", "batch"],
+		for_update=True,
+	)
+	if not holds:
+		return
+
+	SeatHold = frappe.qb.DocType("LMS Seat Hold")
+	(
+		frappe.qb.update(SeatHold)
+		.set(SeatHold.status, "Expired")
+		.where(SeatHold.name.isin([hold.name for hold in holds]))
+		.run()
+	)
+
+	for batch, count in Counter(hold.batch for hold in holds).items():
+		release_seats(batch, count)
+
+
+def reconcile_reserved_seats(batch=None):
+	"""Recomputes the reserved seats of the batches from their enrollments and active holds."""
+	condition = "WHERE name = %(batch)s" if batch else ""
+	frappe.db.sql(
+		f"""
+		UPDATE `tabLMS Batch`
+		SET reserved_seats = (
+			SELECT COUNT(*) FROM `tabLMS Batch Enrollment` enrollment
+			WHERE enrollment.batch = `tabLMS Batch`.name
+		) + (
+			SELECT COUNT(*) FROM `tabLMS Seat Hold` hold
+			WHERE hold.batch = `tabLMS Batch`.name AND hold.status = 'Active'
+		)
+		{condition}
+		""",
+		{"batch": batch},
+	)
+
+	if batch:
+		clear_batch_details_cache(batch)
+	else:
+		frappe.cache().delete_value("lms_batch_details")
@@ -0,0 +1,134 @@
+# Copyright (c) 2026, Frappe and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_days, add_to_date, getdate, now_datetime
+
+from lms.lms.doctype.lms_course.test_lms_course import new_user
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import (
+	expire_seat_holds,
+	has_available_seat,
+	hold_seat,
+	reconcile_reserved_seats,
+	release_seats,
+	reserve_seats,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+
+class UnitTestLMSSeatHold(UnitTestCase):
+	"""
+	Unit tests for LMSSeatHold.
+	Use this class for testing individual functions and methods.
+	"""
+
+	pass
+
+
+class IntegrationTestLMSSeatHold(IntegrationTestCase):
+	"""
+	Integration tests for LMSSeatHold.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.student = new_user("Seat Student", "seat_student@example.com").name
+		self.other_student = new_user("Other Seat Student", "other_seat_student@example.com").name
+		self.batch = new_batch("Seat Ledger Batch", seat_count=2)
+
+	def get_reserved_seats(self):
+		return frappe.db.get_value("LMS Batch", self.batch, "reserved_seats")
+
+	def get_hold_status(self, hold):
+		return frappe.db.get_value("LMS Seat Hold", hold, "status")
+
+	def test_reserve_seats(self):
+		reserve_seats(self.batch)
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+		reserve_seats(self.batch)
+		self.assertEqual(self.get_reserved_seats(), 2)
+
+	def test_release_seats(self):
+		reserve_seats(self.batch, 2)
+		release_seats(self.batch)
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+		# the counter never goes below zero
+		release_seats(self.batch, 2)
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+	def test_sold_out(self):
+		reserve_seats(self.batch, 2)
+		self.assertRaises(frappe.ValidationError, reserve_seats, self.batch)
+		self.assertRaises(frappe.ValidationError, hold_seat, self.batch, self.student)
+		self.assertFalse(has_available_seat(self.batch))
+		self.assertEqual(self.get_reserved_seats(), 2)
+
+	def test_hold_seat(self):
+		hold = hold_seat(self.batch, self.student)
+		self.assertEqual(self.get_hold_status(hold), "Active")
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+		# holding again extends the same hold instead of taking another seat
+		self.assertEqual(hold_seat(self.batch, self.student), hold)
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+		hold_seat(self.batch, self.other_student)
+		self.assertFalse(has_available_seat(self.batch))
+		self.assertTrue(has_available_seat(self.batch, self.student))
+
+	def test_hold_converted_on_enrollment(self):
+		hold = hold_seat(self.batch, self.student)
+		frappe.get_doc(
+			{"doctype": "LMS Batch Enrollment", "batch": self.batch, "member": self.student}
+		).insert()
+
+		self.assertEqual(self.get_hold_status(hold), "Converted")
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+	def test_hold_expiry(self):
+		hold = hold_seat(self.batch, self.student)
+		frappe.db.set_value("LMS Seat Hold", hold, "expires_on", add_to_date(now_datetime(), minutes=-1))
+		active_hold = hold_seat(self.batch, self.other_student)
+
+		expire_seat_holds()
+		self.assertEqual(self.get_hold_status(hold), "Expired")
+		self.assertEqual(self.get_hold_status(active_hold), "Active")
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+	def test_reconcile_reserved_seats(self):
+		hold_seat(self.batch, self.student)
+		frappe.db.set_value("LMS Batch", self.batch, "reserved_seats", 0)
+
+		reconcile_reserved_seats(self.batch)
+		self.assertEqual(self.get_reserved_seats(), 1)
+
+
+def new_batch(title, seat_count=0):
+	instructor = frappe.db.get_value("User", {"user_type": "System User"})
+	return (
+		frappe.get_doc(
+			{
+				"doctype": "LMS Batch",
+				"title": title,
+				"description": title,
+				"batch_details": title,
+				"start_date": getdate(),
+				"end_date": add_days(getdate(), 30),
+				"start_time": "10:00:00",
+				"end_time": "11:00:00",
+				"timezone": "Asia/Kolkata",
+				"seat_count": seat_count,
+				"instructors": [{"instructor": instructor}],
+			}
+		)
+		.insert()
+		.name
+	)
@@ -0,0 +1,130 @@
+# Copyright (c) 2026, Frappe and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import getdate
+
+
+class LMSStreak(Document):
+	pass
+
+
+def update_streak(member, date=None):
+	"""Extends or restarts the weekday streak of the member with a new active day."""
+	date = getdate(date)
+	if date.weekday() in (5, 6):
+		return
+
+	streak = frappe.db.get_value(
+		"LMS Streak",
+		member,
+		["current_streak", "longest_streak", "last_active_date"],
+		as_dict=1,
+		for_update=True,
+	)
+	if not streak:
+		frappe.get_doc(
+			{
+				"doctype": "LMS Streak",
+				"member": member,
+				"current_streak": 1,
+				"longest_streak": 1,
+				"last_active_date": date,
+			}
+		).insert(ignore_permissions=True)
+		return
+
+	last_active_date = getdate(streak.last_active_date) if streak.last_active_date else None
+	if last_active_date and date <= last_active_date:
+		return
+
+	current_streak = streak.current_streak + 1 if date == get_next_weekday(last_active_date) else 1
+	frappe.db.set_value(
+		"LMS Streak",
+		member,
+		{
+			"current_streak": current_streak,
+			"longest_streak": max(streak.longest_streak, current_streak),
+			"last_active_date": date,
+		},
+		update_modified=False,
+	)
+
+
+def get_next_weekday(date):
+	if not date:
+		return None
+
+	next_day = date + timedelta(days=1)
+	while next_day.weekday() in (5, 6):
+		next_day += timedelta(days=1)
+	return next_day
+
+
+def rebuild_streaks(member=None):
+	"""Recomputes the streaks from the daily activity of the member, or of all members."""
+	filters = {"member": member} if member else {}
+	members = frappe.get_all("LMS Daily Activity", filters, pluck="member", distinct=True)
+
+	frappe.db.delete("LMS Streak", filters)
+	for activity_member in members:
+		all_dates = fetch_activity_dates(activity_member)
+		streak, longest_streak = calculate_streaks(all_dates)
+		weekdays = [d for d in all_dates if d.weekday() not in (5, 6)]
+
+		frappe.get_doc(
+			{
+				"doctype": "LMS Streak",
+				"member": activity_member,
+				"current_streak": streak,
+				"longest_streak": longest_streak,
+				"last_active_date": weekdays[-1] if weekdays else None,
+			}
+		).insert(ignore_permissions=True)
+
+
+def fetch_activity_dates(user):
+	return [
+		getdate(d)
+		for d in frappe.get_all("LMS Daily Activity", {"member": user}, pluck="date", order_by="date asc")
+	]
+
+
+def calculate_streaks(all_dates):
+	streak = 0
+	longest_streak = 0
+	prev_day = None
+
+	for d in all_dates:
+		if d.weekday() in (5, 6):
+			continue
+
+		if prev_day:
+			expected = get_next_weekday(prev_day)
+			streak = streak + 1 if d == expected else 1
+		else:
+			streak = 1
+
+		longest_streak = max(longest_streak, streak)
+		prev_day = d
+
+	return streak, longest_streak
+
+
+def calculate_current_streak(all_dates, streak):
+	if not all_dates:
+		return 0
+
+	last_date = all_dates[-1]
+	today = getdate()
+
+	ref_day = today
+	while ref_day.weekday() in (5, 6):
+		ref_day -= timedelta(days=1)
+
+	if last_date == ref_day or last_date == ref_day - timedelta(days=1):
+		return streak
+	return 0
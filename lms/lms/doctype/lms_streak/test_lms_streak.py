@@ -0,0 +1,122 @@
+# Copyright (c) 2026, Frappe and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_days, getdate
+
+from lms.lms.doctype.lms_course.test_lms_course import new_user
+from lms.lms.doctype.lms_streak.lms_streak import (
+	calculate_current_streak,
+	calculate_streaks,
+	rebuild_streaks,
+	update_streak,
+)
+
+# On IntegrationTestCase, the doctype test records and all
+# link-field test record dependencies are recursively loaded
+# Use these module variables to add/remove to/from that list
+EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
+
+# Monday, 12 October 2026
+MONDAY = getdate("2026-10-12")
+
+
+def weekday(offset):
+	return getdate(add_days(MONDAY, offset))
+
+
+class UnitTestLMSStreak(UnitTestCase):
+	"""
+	Unit tests for LMSStreak.
+	Use this class for testing individual functions and methods.
+	"""
+
+	def test_calculate_streaks(self):
+		self.assertEqual(calculate_streaks([]), (0, 0))
+		self.assertEqual(calculate_streaks([weekday(0), weekday(1), weekday(2)]), (3, 3))
+
+		# the weekend does not break the streak, and weekend days are not counted
+		self.assertEqual(calculate_streaks([weekday(4), weekday(5), weekday(7)]), (2, 2))
+
+		# the longest streak survives the reset after a gap
+		self.assertEqual(calculate_streaks([weekday(0), weekday(1), weekday(2), weekday(4)]), (1, 3))
+
+	def test_calculate_current_streak(self):
+		self.assertEqual(calculate_current_streak([], 3), 0)
+		self.assertEqual(calculate_current_streak([weekday(0)], 1), 0)
+
+		last_weekday = getdate()
+		while last_weekday.weekday() in (5, 6):
+			last_weekday = getdate(add_days(last_weekday, -1))
+		self.assertEqual(calculate_current_streak([last_weekday], 4), 4)
+
+
+class IntegrationTestLMSStreak(IntegrationTestCase):
+	"""
+	Integration tests for LMSStreak.
+	Use this class for testing interactions between multiple components.
+	"""
+
+	def setUp(self):
+		self.member = new_user("Streak Student", "streak_student@example.com").name
+		frappe.db.delete("LMS Streak", {"member": self.member})
+
+	def get_streak(self):
+		return frappe.db.get_value(
+			"LMS Streak",
+			self.member,
+			["current_streak", "longest_streak", "last_active_date"],
+			as_dict=1,
+		)
+
+	def test_consecutive_days(self):
+		update_streak(self.member, weekday(0))
+		update_streak(self.member, weekday(1))
+		self.assertEqual(self.get_streak().current_streak, 2)
+
+		# Friday is followed by Monday
+		update_streak(self.member, weekday(2))
+		update_streak(self.member, weekday(3))
+		update_streak(self.member, weekday(4))
+		update_streak(self.member, weekday(7))
+
+		streak = self.get_streak()
+		self.assertEqual(streak.current_streak, 6)
+		self.assertEqual(streak.longest_streak, 6)
+		self.assertEqual(getdate(streak.last_active_date), weekday(7))
+
+	def test_same_day(self):
+		update_streak(self.member, weekday(0))
+		update_streak(self.member, weekday(1))
+		update_streak(self.member, weekday(1))
+		update_streak(self.member, weekday(0))
+
+		streak = self.get_streak()
+		self.assertEqual(streak.current_streak, 2)
+		self.assertEqual(getdate(streak.last_active_date), weekday(1))
+
+	def test_reset_after_gap(self):
+		for offset in (0, 1, 2, 4, 7):
+			update_streak(self.member, weekday(offset))
+
+		streak = self.get_streak()
+		self.assertEqual(streak.current_streak, 2)
+		self.assertEqual(streak.longest_streak, 3)
+
+	def test_rebuild_matches_updates(self):
+		offsets = (0, 1, 3, 4, 5, 7, 8)
+		for offset in offsets:
+			frappe.get_doc(
+				{"doctype": "LMS Daily Activity", "member": self.member, "date": weekday(offset)}
+			).insert(ignore_permissions=True)
+			update_streak(self.member, weekday(offset))
+
+		incremental = self.get_streak()
+		rebuild_streaks(self.member)
+		self.assertEqual(self.get_streak(), incremental)
+
+	def tearDown(self):
+		frappe.db.delete("LMS Daily Activity", {"member": self.member})
+		frappe.db.delete("LMS Streak", {"member": self.member})
@@ -11,6 +11,13 @@ Apps can provide a hook lms_markdown_macro_renderers, a
 dictionary mapping the macro name to the function that to render
 that macro. The function will get the argument passed to the macro
 as argument.
+
+Apps can also provide a hook lms_markdown_macro_prefetchers, mapping
+the macro name to a function that takes the list of all arguments used
+for that macro in a document and returns a dictionary mapping each
+argument to its data. When a prefetcher is registered, the renderer gets
+the prefetched data as the second argument, so that the data for all
+macros in a document is loaded in bulk instead of once per macro.
 """
 
 import html as HTML
@@ -20,13 +27,15 @@ import xml.etree.ElementTree as etree
 import frappe
 import markdown
 from bs4 import BeautifulSoup
+from frappe.utils.caching import site_cache
 from markdown import Extension
 from markdown.inlinepatterns import InlineProcessor
 
 
 def markdown_to_html(text):
 	"""Renders markdown text into html."""
-	return markdown.markdown(text, extensions=["fenced_code", MacroExtension()])
+	renderer = MacroRenderer(find_macros(text))
+	return markdown.markdown(text, extensions=["fenced_code", MacroExtension(renderer=renderer)])
 
 
 def find_macros(text):
@@ -61,11 +70,18 @@ def _remove_quotes(value):
 	return value.strip(" '\"")
 
 
+@site_cache
 def get_macro_registry():
 	d = frappe.get_hooks("lms_markdown_macro_renderers") or {}
 	return {name: frappe.get_attr(klass[0]) for name, klass in d.items()}
 
 
+@site_cache
+def get_macro_prefetchers():
+	d = frappe.get_hooks("lms_markdown_macro_prefetchers") or {}
+	return {name: frappe.get_attr(method[0]) for name, method in d.items()}
+
+
 def render_macro(macro_name, macro_argument):
 	# stripping the quotes on either side of the argument
 	macro_argument = _remove_quotes(macro_argument)
@@ -80,13 +96,62 @@ def render_macro(macro_name, macro_argument):
 MACRO_RE = r"{{ *(\w+)\(([^{}]*)\) *}}"
 
 
+class MacroRenderer:
+	"""MacroRenderer renders all the macros of a single document.
+
+	The data for the macros is prefetched in bulk using the registered
+	prefetchers and every (macro, argument) pair is rendered and sanitized
+	only once, however many times it occurs in the document.
+	"""
+
+	def __init__(self, macros=None):
+		self.registry = get_macro_registry()
+		self.prefetched = self.prefetch(macros or [])
+		self.rendered = {}
+
+	def prefetch(self, macros):
+		arguments = {}
+		for name, argument in macros:
+			arguments.setdefault(name, []).append(argument)
+
+		prefetched = {}
+		for name, prefetcher in get_macro_prefetchers().items():
+			if name in arguments and name in self.registry:
+				prefetched[name] = prefetcher(list(set(arguments[name])))
+
+		return prefetched
+
+	def render(self, macro_name, macro_argument):
+		"""Returns the sanitized html of the macro."""
+		macro_argument = _remove_quotes(macro_argument)
+		key = (macro_name, macro_argument)
+
+		if key not in self.rendered:
+			if macro_name not in self.registry:
+				html = f"<p>Unknown macro: {macro_name}</p>"
+			elif macro_name in self.prefetched:
+				data = self.prefetched[macro_name].get(macro_argument)
+				html = self.registry[macro_name](macro_argument, data)
+			else:
+				html = self.registry[macro_name](macro_argument)
+
+			self.rendered[key] = sanitize_html(str(html), macro_name)
+
+		return self.rendered[key]
+
+
 class MacroExtension(Extension):
 	"""MacroExtension is a markdown extension to support macro syntax."""
 
+	def __init__(self, renderer=None, **kwargs):
+		self.renderer = renderer
+		super().__init__(**kwargs)
+
 	def extendMarkdown(self, md):
 		self.md = md
 		pattern = MacroInlineProcessor(MACRO_RE)
 		pattern.md = md
+		pattern.renderer = self.renderer or MacroRenderer()
 		md.inlinePatterns.register(pattern, "macro", 75)
 
 
@@ -101,8 +166,7 @@ class MacroInlineProcessor(InlineProcessor):
 		"""
 		macro = m.group(1)
 		arg = m.group(2)
-		html = render_macro(macro, arg)
-		html = sanitize_html(str(html), macro)
+		html = self.renderer.render(macro, arg)
 		e = etree.fromstring(html)
 		return e, m.start(0), m.end(0)
 
@@ -1,4 +1,7 @@
 import frappe
+from frappe.utils import cint
+
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import hold_seat
 
 
 def get_payment_gateway():
@@ -134,6 +137,10 @@ def record_payment(
 		)
 
 	payment_doc.save(ignore_permissions=True)
+
+	if doctype == "LMS Batch" and not cint(payment_for_certificate):
+		hold_seat(docname, frappe.session.user, payment_doc.name)
+
 	return payment_doc
 
 
@@ -0,0 +1,161 @@
+"""Dispatcher for the scheduled reminder emails.
+
+The template of a reminder is rendered once per event (a batch, a live
+class, a course...) with placeholders for the fields that differ between
+recipients, which are merged into the rendered email for every recipient.
+The emails are queued in chunks. The LMS Reminder Logs of a chunk are
+inserted first, keyed by reminder, document, recipient and day, and only
+the recipients whose log was inserted by this run are emailed, in the same
+transaction. A retried or concurrent job skips the recipients who were
+already sent the reminder on that day.
+"""
+
+import hashlib
+
+import frappe
+from frappe.email.doctype.email_template.email_template import get_email_template
+from frappe.utils import escape_html, now, nowdate
+
+CHUNK_SIZE = 500
+
+
+def send_reminders(
+	reminder,
+	reference_doctype,
+	reference_name,
+	recipients,
+	subject,
+	template=None,
+	custom_template=None,
+	args=None,
+	header=None,
+	cc=None,
+	retry=1,
+):
+	"""Queues the reminder for all the recipients who haven't received it today.
+
+	`recipients` is a list of frappe._dict with the email of the recipient and the
+	template fields that are specific to them, e.g. {"email": ..., "student_name": ...}.
+	"""
+	today = nowdate()
+	dispatch = frappe.generate_hash()
+	unique_recipients = {}
+	for recipient in recipients:
+		recipient.log_name = get_log_name(reminder, reference_doctype, reference_name, recipient.email, today)
+		unique_recipients.setdefault(recipient.log_name, recipient)
+
+	recipients = get_pending_recipients(list(unique_recipients.values()))
+	if not recipients:
+		return
+
+	merge_fields = [field for field in recipients[0] if field not in ("email", "log_name")]
+	subject, content = render_reminder(subject, template, custom_template, args or {}, merge_fields)
+
+	for start in range(0, len(recipients), CHUNK_SIZE):
+		chunk = recipients[start : start + CHUNK_SIZE]
+		chunk = insert_logs(reminder, reference_doctype, reference_name, chunk, today, dispatch)
+
+		for recipient in chunk:
+			recipient_subject = merge_fields_into(subject, recipient, merge_fields)
+			frappe.sendmail(
+				recipients=recipient.email,
+				cc=cc,
+				subject=recipient_subject,
+				content=merge_fields_into(content, recipient, merge_fields, escape=True),
+				header=header or [recipient_subject, "green"],
+				retry=retry,
+			)
+
+		frappe.db.commit()
+
+
+def get_log_name(reminder, reference_doctype, reference_name, email, date):
+	key = f"{reminder}:{reference_doctype}:{reference_name}:{email}:{date}"
+	return hashlib.md5(key.encode()).hexdigest()
+
+
+def get_pending_recipients(recipients):
+	"""Leaves out the recipients who were sent the reminder already, so that
+	nothing is rendered once everyone was reached."""
+	sent = set()
+	names = [recipient.log_name for recipient in recipients]
+	for start in range(0, len(names), CHUNK_SIZE):
+		sent.update(
+			frappe.get_all(
+				"LMS Reminder Log", {"name": ["in", names[start : start + CHUNK_SIZE]]}, pluck="name"
+			)
+		)
+
+	return [recipient for recipient in recipients if recipient.log_name not in sent]
+
+
+def render_reminder(subject, template, custom_template, args, merge_fields):
+	"""Renders the subject and the message once, with a placeholder for every merge field."""
+	args = {**args, **{field: get_placeholder(field) for field in merge_fields}}
+
+	if custom_template:
+		email_template = get_email_template(custom_template, args)
+		return email_template.get("subject"), email_template.get("message")
+
+	return subject, frappe.get_template(f"templates/emails/{template}.html").render(args)
+
+
+def merge_fields_into(text, recipient, merge_fields, escape=False):
+	for field in merge_fields:
+		value = str(recipient.get(field) or "")
+		text = text.replace(get_placeholder(field), escape_html(value) if escape else value)
+	return text
+
+
+def get_placeholder(field):
+	return f"[[{field}]]"
+
+
+def insert_logs(reminder, reference_doctype, reference_name, recipients, date, dispatch):
+	"""Inserts the logs that don't exist yet and returns the recipients whose log was inserted.
+
+	A job sending the same reminder at the same time waits on the logs inserted
+	here and skips them, so every recipient is claimed by exactly one run."""
+	timestamp = now()
+	frappe.db.bulk_insert(
+		"LMS Reminder Log",
+		[
+			"name",
+			"reminder",
+			"reference_doctype",
+			"reference_name",
+			"recipient",
+			"sent_on",
+			"dispatch",
+			"owner",
+			"modified_by",
+			"creation",
+			"modified",
+		],
+		[
+			(
+				recipient.log_name,
+				reminder,
+				reference_doctype,
+				reference_name,
+				recipient.email,
+				date,
+				dispatch,
+				"Administrator",
+				"Administrator",
+				timestamp,
+				timestamp,
+			)
+			for recipient in recipients
+		],
+		ignore_duplicates=True,
+	)
+
+	inserted = set(
+		frappe.get_all(
+			"LMS Reminder Log",
+			{"name": ["in", [recipient.log_name for recipient in recipients]], "dispatch": dispatch},
+			pluck="name",
+		)
+	)
+	return [recipient for recipient in recipients if recipient.log_name in inserted]
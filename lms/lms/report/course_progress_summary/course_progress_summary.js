@@ -11,5 +11,18 @@ frappe.query_reports["Course Progress Summary"] = {
 			options: "LMS Course",
 			reqd: 1,
 		},
+		{
+			fieldname: "page",
+			label: __("Page"),
+			fieldtype: "Int",
+			default: 1,
+		},
+		{
+			fieldname: "page_length",
+			label: __("Page Length"),
+			fieldtype: "Select",
+			options: ["100", "500", "1000", "5000"],
+			default: "500",
+		},
 	],
 };
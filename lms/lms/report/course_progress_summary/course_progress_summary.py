@@ -3,44 +3,52 @@
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Coalesce, Count, Floor
 from frappe.utils import cint
 
 
 def execute(filters=None):
-	columns, data = [], []
+	filters = frappe._dict(filters or {})
 	columns = get_columns()
 	data = get_data(filters)
-	charts = get_charts(data)
+	charts = get_charts(filters)
 	return columns, data, [], charts
 
 
 def get_data(filters=None):
-	summary = []
-	query_filter = {}
-	if filters:
-		query_filter = {"course": filters.course}
+	"""Returns a page of enrollments with the course title joined in."""
+	filters = frappe._dict(filters or {})
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
+	Course = frappe.qb.DocType("LMS Course")
+	page_length = cint(filters.page_length) or 500
+	start = (max(cint(filters.page), 1) - 1) * page_length
 
-	memberships = frappe.get_all(
-		"LMS Enrollment",
-		query_filter,
-		["name", "course", "member", "member_name", "progress"],
-		order_by="course",
+	query = (
+		frappe.qb.from_(Enrollment)
+		.left_join(Course)
+		.on(Course.name == Enrollment.course)
+		.select(
+			Enrollment.course,
+			Course.title.as_("course_name"),
+			Enrollment.member,
+			Enrollment.member_name,
+			Floor(Coalesce(Enrollment.progress, 0)).as_("progress"),
+		)
+		.orderby(Enrollment.course)
+		.orderby(Enrollment.name)
+		.limit(page_length)
+		.offset(start)
 	)
+	query = apply_filters(query, Enrollment, filters)
+
+	return query.run(as_dict=True)
 
-	for membership in memberships:
-		summary.append(
-			frappe._dict(
-				{
-					"course": membership.name,
-					"course_name": frappe.db.get_value("LMS Course", membership.course, "title"),
-					"member": membership.member,
-					"member_name": membership.member_name,
-					"progress": cint(membership.progress),
-				}
-			)
-		)
 
-	return summary
+def apply_filters(query, Enrollment, filters):
+	if filters.course:
+		query = query.where(Enrollment.course == filters.course)
+	return query
 
 
 def get_columns():
@@ -73,48 +81,39 @@ def get_columns():
 		},
 		{
 			"fieldname": "progress",
-			"fieldtype": "Data",
+			"fieldtype": "Int",
 			"label": _("Progress (%)"),
 			"width": 120,
 		},
 	]
 
 
-def get_charts(data):
-	if not data:
-		return None
-
-	completed = 0
-	less_than_hundred = 0
-	less_than_seventy_one = 0
-	less_than_forty_one = 0
-	less_than_eleven = 0
+def get_charts(filters):
+	"""Builds the progress chart with one GROUP BY query over all the matching enrollments."""
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
+	progress = Floor(Coalesce(Enrollment.progress, 0))
+	bucket = (
+		Case()
+		.when(progress >= 100, "100")
+		.when(progress > 70, "71-99")
+		.when(progress > 40, "41-70")
+		.when(progress > 10, "11-40")
+		.else_("0-10")
+	)
 
-	for row in data:
-		if row.progress == 100:
-			completed += 1
-		elif row.progress < 100 and row.progress > 70:
-			less_than_hundred += 1
-		elif row.progress < 71 and row.progress > 40:
-			less_than_seventy_one += 1
-		elif row.progress < 41 and row.progress > 10:
-			less_than_forty_one += 1
-		elif row.progress < 11:
-			less_than_eleven += 1
+	query = frappe.qb.from_(Enrollment).select(bucket.as_("bucket"), Count("*").as_("count")).groupby(bucket)
+	counts = {row.bucket: row.count for row in apply_filters(query, Enrollment, filters).run(as_dict=True)}
+	if not counts:
+		return None
 
+	labels = ["0-10", "11-40", "41-70", "71-99", "100"]
 	charts = {
 		"data": {
-			"labels": ["0-10", "11-40", "41-70", "71-99", "100"],
+			"labels": labels,
 			"datasets": [
 				{
 					"name": "Progress (%)",
-					"values": [
-						less_than_eleven,
-						less_than_forty_one,
-						less_than_seventy_one,
-						less_than_hundred,
-						completed,
-					],
+					"values": [counts.get(label, 0) for label in labels],
 				}
 			],
 		},
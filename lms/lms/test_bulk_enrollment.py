@@ -0,0 +1,99 @@
+import unittest
+
+import frappe
+from frappe.utils import cint
+
+from lms.lms.doctype.lms_course.test_lms_course import new_course, new_user
+from lms.lms.doctype.lms_seat_hold.test_lms_seat_hold import new_batch
+
+from .bulk_enrollment import enroll_members, import_enrollments, parse_members, validate_members
+
+
+class TestBulkEnrollment(unittest.TestCase):
+	def setUp(self):
+		self.members = [
+			new_user(f"Bulk Student {i}", f"bulk_student{i}@example.com").name for i in range(1, 4)
+		]
+		self.course = new_course("Bulk Enrollment Course")
+		self.batch = new_batch("Bulk Enrollment Batch", seat_count=2)
+
+	def get_enrolled(self, doctype, docname):
+		fieldname = "batch" if doctype == "LMS Batch Enrollment" else "course"
+		return sorted(frappe.get_all(doctype, {fieldname: docname}, pluck="member"))
+
+	def test_validate_members(self):
+		members = [*self.members, self.members[0], "unknown_member@example.com"]
+		summary = validate_members("LMS Course", self.course.name, members)
+
+		self.assertEqual(summary.members, self.members)
+		self.assertEqual(summary.duplicates, [self.members[0]])
+		self.assertEqual(summary.invalid_users, ["unknown_member@example.com"])
+
+	def test_enroll_in_course(self):
+		enrollments = cint(frappe.db.get_value("LMS Course", self.course.name, "enrollments"))
+		enroll_members("LMS Course", self.course.name, self.members, chunk_size=2)
+
+		self.assertEqual(self.get_enrolled("LMS Enrollment", self.course.name), sorted(self.members))
+		self.assertEqual(
+			frappe.db.get_value("LMS Course", self.course.name, "enrollments"),
+			enrollments + len(self.members),
+		)
+
+		summary = validate_members("LMS Course", self.course.name, self.members)
+		self.assertEqual(summary.members, [])
+		self.assertEqual(summary.already_enrolled, self.members)
+
+	def test_paid_course_eligibility(self):
+		frappe.db.set_value(
+			"LMS Course", self.course.name, {"paid_course": 1, "course_price": 100, "currency": "INR"}
+		)
+		summary = validate_members("LMS Course", self.course.name, self.members)
+
+		self.assertEqual(summary.members, [])
+		self.assertEqual(summary.ineligible, self.members)
+
+	def test_batch_seats(self):
+		self.assertRaises(
+			frappe.ValidationError, import_enrollments, "LMS Batch", self.batch, data=self.members
+		)
+		self.assertEqual(frappe.db.get_value("LMS Batch", self.batch, "reserved_seats"), 0)
+
+		result = import_enrollments("LMS Batch", self.batch, data=self.members[:2])
+		self.assertEqual(result["enrolling"], 2)
+		self.assertEqual(frappe.db.get_value("LMS Batch", self.batch, "reserved_seats"), 2)
+
+	def test_skipped_members_release_seats(self):
+		frappe.db.set_value("LMS Batch", self.batch, "seat_count", 3)
+		import_enrollments("LMS Batch", self.batch, data=self.members[:2])
+
+		# the first member enrolls on their own before the job runs
+		frappe.get_doc(
+			{"doctype": "LMS Batch Enrollment", "batch": self.batch, "member": self.members[0]}
+		).insert()
+		self.assertEqual(frappe.db.get_value("LMS Batch", self.batch, "reserved_seats"), 3)
+
+		enroll_members("LMS Batch", self.batch, self.members[:2])
+		self.assertEqual(self.get_enrolled("LMS Batch Enrollment", self.batch), sorted(self.members[:2]))
+		self.assertEqual(frappe.db.get_value("LMS Batch", self.batch, "reserved_seats"), 2)
+
+	def test_file_permission(self):
+		file = frappe.get_doc(
+			{
+				"doctype": "File",
+				"file_name": "bulk_members.csv",
+				"content": "email\n" + "\n".join(self.members),
+				"is_private": 1,
+			}
+		).insert()
+		self.assertEqual(parse_members(file_url=file.file_url), self.members)
+
+		frappe.session.user = self.members[0]
+		self.assertRaises(frappe.PermissionError, parse_members, file_url=file.file_url)
+
+	def tearDown(self):
+		frappe.session.user = "Administrator"
+		frappe.db.delete("File", {"file_name": "bulk_members.csv"})
+		frappe.db.delete("LMS Batch Enrollment", {"batch": self.batch})
+		frappe.db.delete("LMS Enrollment", {"course": self.course.name})
+		frappe.db.delete("LMS Batch", self.batch)
+		frappe.db.set_value("LMS Course", self.course.name, {"paid_course": 0, "enrollments": 0})
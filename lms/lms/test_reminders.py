@@ -0,0 +1,76 @@
+import unittest
+
+import frappe
+from frappe.utils import nowdate
+
+from .reminders import get_log_name, insert_logs, merge_fields_into, render_reminder, send_reminders
+
+REMINDER = "test_reminder"
+REFERENCE = ("LMS Course", "reminder-test-course")
+
+
+class TestReminders(unittest.TestCase):
+	def setUp(self):
+		self.recipients = [
+			frappe._dict({"email": "reminder_one@example.com", "student_name": "<b>One</b>"}),
+			frappe._dict({"email": "reminder_two@example.com", "student_name": "Two"}),
+		]
+		frappe.get_doc(
+			{
+				"doctype": "Email Template",
+				"name": "Test Reminder",
+				"subject": "Reminder for {{ student_name }}",
+				"response": "Hi {{ student_name }}, {{ title }} starts tomorrow.",
+			}
+		).insert(ignore_if_duplicate=True)
+
+	def get_recipients(self):
+		return [frappe._dict(recipient) for recipient in self.recipients]
+
+	def get_logs(self):
+		return frappe.get_all(
+			"LMS Reminder Log", {"reminder": REMINDER}, ["recipient", "dispatch"], order_by="recipient"
+		)
+
+	def get_queued_emails(self, email):
+		return frappe.db.count("Email Queue Recipient", {"recipient": email})
+
+	def test_merge_fields(self):
+		subject, content = render_reminder(None, None, "Test Reminder", {"title": "Python"}, ["student_name"])
+		self.assertEqual(subject, "Reminder for [[student_name]]")
+		self.assertEqual(content, "Hi [[student_name]], Python starts tomorrow.")
+
+		recipient = self.recipients[0]
+		self.assertEqual(merge_fields_into(subject, recipient, ["student_name"]), "Reminder for <b>One</b>")
+		self.assertEqual(
+			merge_fields_into(content, recipient, ["student_name"], escape=True),
+			"Hi &lt;b&gt;One&lt;/b&gt;, Python starts tomorrow.",
+		)
+
+	def test_skip_on_retry(self):
+		send_reminders(REMINDER, *REFERENCE, self.get_recipients(), None, custom_template="Test Reminder")
+		send_reminders(REMINDER, *REFERENCE, self.get_recipients(), None, custom_template="Test Reminder")
+
+		logs = self.get_logs()
+		self.assertEqual([log.recipient for log in logs], [recipient.email for recipient in self.recipients])
+		for recipient in self.recipients:
+			self.assertEqual(self.get_queued_emails(recipient.email), 1)
+
+	def test_logs_claimed_once(self):
+		recipients = self.get_recipients()
+		for recipient in recipients:
+			recipient.log_name = get_log_name(REMINDER, *REFERENCE, recipient.email, nowdate())
+
+		# a run that already inserted the first log claims it, the other run only gets the second
+		insert_logs(REMINDER, *REFERENCE, recipients[:1], nowdate(), "first")
+		claimed = insert_logs(REMINDER, *REFERENCE, recipients, nowdate(), "second")
+
+		self.assertEqual([recipient.email for recipient in claimed], [recipients[1].email])
+		self.assertEqual([log.dispatch for log in self.get_logs()], ["first", "second"])
+
+	def tearDown(self):
+		frappe.db.delete("LMS Reminder Log", {"reminder": REMINDER})
+		for recipient in self.recipients:
+			queue = frappe.get_all("Email Queue Recipient", {"recipient": recipient.email}, pluck="parent")
+			frappe.db.delete("Email Queue Recipient", {"parent": ["in", queue]})
+			frappe.db.delete("Email Queue", {"name": ["in", queue]})
@@ -7,11 +7,14 @@ from lms.lms.doctype.lms_certificate.lms_certificate import get_default_certific
 from .utils import (
 	get_average_rating,
 	get_chapters,
+	get_course_outline,
 	get_instructors,
+	get_lesson_count,
 	get_lesson_index,
 	get_lesson_url,
 	get_lessons,
 	get_membership,
+	get_neighbour_lesson,
 	get_reviews,
 	get_tags,
 	has_course_instructor_role,
@@ -19,6 +22,7 @@ from .utils import (
 	has_moderator_role,
 	has_student_role,
 	is_instructor,
+	refresh_course_lesson_count,
 	slugify,
 )
 
@@ -150,6 +154,20 @@ class TestUtils(unittest.TestCase):
 				self.assertEqual(lesson.title, f"Lesson {j} of {chapter.chapter}")
 				self.assertEqual(lesson.number, f"{chapter.idx}-{j}")
 
+	def test_get_course_outline(self):
+		outline = get_course_outline(self.course.name)
+		self.assertEqual(len(outline), len(self.course.chapters))
+
+		for chapter in outline:
+			self.assertEqual(len(chapter.lessons), 2)
+			for j, lesson in enumerate(chapter.lessons, start=1):
+				self.assertEqual(lesson.number, f"{chapter.idx}-{j}")
+
+		# the cached tree is invalidated when a chapter is renamed
+		frappe.db.set_value("Course Chapter", outline[0].name, "title", "Renamed Chapter")
+		frappe.get_doc("Course Chapter", outline[0].name).save()
+		self.assertEqual(get_course_outline(self.course.name)[0].title, "Renamed Chapter")
+
 	def test_get_tags(self):
 		tags = get_tags(self.course.name)
 		expected_tags = ["Frappe", "Learning", "Utility"]
@@ -164,6 +182,46 @@ class TestUtils(unittest.TestCase):
 		average_rating = get_average_rating(self.course.name)
 		self.assertEqual(average_rating, 4.5)
 
+	def test_course_counters(self):
+		self.assertEqual(get_lesson_count(self.course.name), 6)
+		self.assertEqual(self.get_enrollment_count(), 2)
+
+		frappe.db.set_value("LMS Course", self.course.name, "lessons", 0)
+		refresh_course_lesson_count(self.course.name)
+		self.assertEqual(get_lesson_count(self.course.name), 6)
+
+	def test_enrollment_counter(self):
+		student3 = self.create_user("student3@example.com", "Emily", "Cooper", ["LMS Student"])
+		self.add_enrollment(self.course.name, student3.email)
+		self.assertEqual(self.get_enrollment_count(), 3)
+
+		enrollment = frappe.get_doc("LMS Enrollment", {"course": self.course.name, "member": student3.email})
+		enrollment.member_type = "Mentor"
+		enrollment.save()
+		self.assertEqual(self.get_enrollment_count(), 2)
+
+		enrollment.member_type = "Student"
+		enrollment.save()
+		self.assertEqual(self.get_enrollment_count(), 3)
+
+		enrollment.delete()
+		self.assertEqual(self.get_enrollment_count(), 2)
+		frappe.delete_doc("User", student3.email)
+
+	def test_rating_counter(self):
+		review = frappe.get_doc(
+			"LMS Course Review", {"course": self.course.name, "owner": self.student1.email}
+		)
+		review.rating = 0.6
+		review.save()
+		self.assertEqual(get_average_rating(self.course.name), 4.0)
+
+		review.delete()
+		self.assertEqual(get_average_rating(self.course.name), 5.0)
+
+	def get_enrollment_count(self):
+		return frappe.db.get_value("LMS Course", self.course.name, "enrollments")
+
 	def add_rating(self, course_name, member, rating, review):
 		frappe.session.user = member
 		review = frappe.new_doc("LMS Course Review")
@@ -196,6 +254,11 @@ class TestUtils(unittest.TestCase):
 			expected_url = f"/lms/courses/{self.course.name}/learn/{lesson.number}"
 			self.assertEqual(get_lesson_url(self.course.name, lesson.number), expected_url)
 
+	def test_get_neighbour_lesson(self):
+		self.assertEqual(get_neighbour_lesson(self.course.name, 1, 1), {"prev": None, "next": "1.2"})
+		self.assertEqual(get_neighbour_lesson(self.course.name, 1, 2), {"prev": "1.1", "next": "2.1"})
+		self.assertEqual(get_neighbour_lesson(self.course.name, 3, 2), {"prev": "3.1", "next": None})
+
 	def test_is_instructor(self):
 		frappe.session.user = "frappe@example.com"
 		self.assertTrue(is_instructor(self.course.name))
@@ -1,3 +1,4 @@
+import copy
 import hashlib
 import json
 import re
@@ -10,6 +11,7 @@ from frappe.desk.doctype.notification_log.notification_log import make_notificat
 from frappe.desk.notifications import extract_mentions
 from frappe.rate_limiter import rate_limit
 from frappe.utils import (
+	add_days,
 	add_months,
 	cint,
 	flt,
@@ -19,10 +21,14 @@ from frappe.utils import (
 	get_fullname,
 	get_time_str,
 	getdate,
+	now_datetime,
 	nowtime,
 	pretty_date,
 	rounded,
+	time_diff_in_seconds,
 )
+from frappe.utils.caching import redis_cache, request_cache
+from redis.exceptions import ResponseError
 
 from lms.lms.md import find_macros
 from lms.lms.quiz_availability import get_quiz_availability
@@ -96,74 +102,199 @@ def get_chapters(course):
 	"""Returns all chapters of this course."""
 	if not course:
 		return []
-	chapters = frappe.get_all("Chapter Reference", {"parent": course}, ["idx", "chapter"], order_by="idx")
-	for chapter in chapters:
-		chapter_details = frappe.db.get_value(
-			"Course Chapter",
-			{"name": chapter.chapter},
-			["name", "title"],
-			as_dict=True,
-		)
-		chapter.update(chapter_details)
-	return chapters
+	return [
+		frappe._dict(idx=chapter.idx, chapter=chapter.name, name=chapter.name, title=chapter.title)
+		for chapter in get_cached_course_outline(course)
+	]
 
 
 def get_lessons(course, chapter=None, get_details=True, progress=False):
 	"""If chapter is passed, returns lessons of only that chapter.
 	Else returns lessons of all chapters of the course"""
-	lessons = []
-	lesson_count = 0
 	if chapter:
 		if get_details:
 			return get_lesson_details(chapter, progress=progress)
 		else:
 			return frappe.db.count("Lesson Reference", {"parent": chapter.name})
 
-	for chapter in get_chapters(course):
-		if get_details:
-			lessons += get_lesson_details(chapter, progress=progress)
-		else:
-			lesson_count += frappe.db.count("Lesson Reference", {"parent": chapter.name})
+	if not get_details:
+		return sum(len(chapter.lessons) for chapter in get_cached_course_outline(course))
 
-	return lessons if get_details else lesson_count
+	return [lesson for chapter in get_course_outline(course, progress=progress) for lesson in chapter.lessons]
 
 
 def get_lesson_details(chapter, progress=False):
-	lessons = []
-	lesson_list = frappe.get_all(
-		"Lesson Reference", {"parent": chapter.name}, ["lesson", "idx"], order_by="idx"
-	)
-	for row in lesson_list:
-		lesson_details = frappe.db.get_value(
-			"Course Lesson",
-			row.lesson,
-			[
-				"name",
-				"title",
-				"include_in_preview",
-				"body",
-				"creation",
-				"youtube",
-				"quiz_id",
-				"question",
-				"file_type",
-				"instructor_notes",
-				"course",
-				"chapter",
-				"content",
-			],
-			as_dict=True,
+	lessons = get_chapter_lessons([chapter.name])
+	for lesson in lessons:
+		lesson.number = f"{chapter.idx}-{lesson.pop('reference_idx')}"
+		lesson.pop("reference_chapter")
+
+	if progress and lessons:
+		completed_lessons = get_completed_lessons(lessons[0].course)
+		for lesson in lessons:
+			lesson.is_complete = lesson.name in completed_lessons
+
+	return lessons
+
+
+def get_lesson_outline_fields():
+	return [
+		"name",
+		"title",
+		"include_in_preview",
+		"body",
+		"creation",
+		"youtube",
+		"quiz_id",
+		"question",
+		"file_type",
+		"instructor_notes",
+		"course",
+		"chapter",
+		"content",
+	]
+
+
+def get_chapter_lessons(chapters):
+	"""Returns the lessons of all the given chapters in a single query, ordered by their index."""
+	if not chapters:
+		return []
+
+	LessonReference = frappe.qb.DocType("Lesson Reference")
+	CourseLesson = frappe.qb.DocType("Course Lesson")
+
+	lessons = (
+		frappe.qb.from_(LessonReference)
+		.join(CourseLesson)
+		.on(LessonReference.lesson == CourseLesson.name)
+		.select(
+			LessonReference.parent.as_("reference_chapter"),
+			LessonReference.idx.as_("reference_idx"),
+			*[CourseLesson[field] for field in get_lesson_outline_fields()],
 		)
-		lesson_details.number = f"{chapter.idx}-{row.idx}"
-		lesson_details.icon = get_lesson_icon(lesson_details.body, lesson_details.content)
+		.where(LessonReference.parent.isin(chapters))
+		.orderby(LessonReference.idx)
+		.run(as_dict=True)
+	)
 
-		if progress:
-			lesson_details.is_complete = get_progress(lesson_details.course, lesson_details.name)
+	for lesson in lessons:
+		lesson.icon = get_lesson_icon(lesson.body, lesson.content)
 
-		lessons.append(lesson_details)
 	return lessons
 
 
+def get_cached_course_outline(course):
+	"""Returns the member independent outline of the course.
+
+	The outline is built with a handful of joined queries and kept in redis
+	until one of the chapters, lessons or their references is modified.
+	Callers must not mutate the returned tree, use `get_course_outline` instead."""
+	return frappe.cache().hget("lms_course_outline", course, generator=lambda: build_course_outline(course))
+
+
+def build_course_outline(course):
+	ChapterReference = frappe.qb.DocType("Chapter Reference")
+	CourseChapter = frappe.qb.DocType("Course Chapter")
+
+	chapters = (
+		frappe.qb.from_(ChapterReference)
+		.join(CourseChapter)
+		.on(ChapterReference.chapter == CourseChapter.name)
+		.select(
+			CourseChapter.name,
+			CourseChapter.title,
+			CourseChapter.is_scorm_package,
+			CourseChapter.launch_file,
+			CourseChapter.scorm_package,
+			ChapterReference.idx,
+		)
+		.where(ChapterReference.parent == course)
+		.orderby(ChapterReference.idx)
+		.run(as_dict=True)
+	)
+
+	lessons_by_chapter = {}
+	for lesson in get_chapter_lessons([chapter.name for chapter in chapters]):
+		lessons_by_chapter.setdefault(lesson.pop("reference_chapter"), []).append(lesson)
+
+	scorm_packages = get_scorm_package_details(
+		[chapter.scorm_package for chapter in chapters if chapter.is_scorm_package]
+	)
+
+	for chapter in chapters:
+		chapter.lessons = lessons_by_chapter.get(chapter.name, [])
+		for lesson in chapter.lessons:
+			lesson.number = f"{chapter.idx}-{lesson.pop('reference_idx')}"
+
+		if chapter.is_scorm_package:
+			chapter.scorm_package = scorm_packages.get(chapter.scorm_package)
+
+	return chapters
+
+
+def get_scorm_package_details(packages):
+	if not packages:
+		return {}
+
+	files = frappe.get_all(
+		"File",
+		{"name": ["in", packages]},
+		["name", "file_name", "file_size", "file_url"],
+	)
+	return {file.pop("name"): file for file in files}
+
+
+def get_completed_lessons(course, member=None):
+	if not member:
+		member = frappe.session.user
+
+	return set(
+		frappe.get_all(
+			"LMS Course Progress",
+			{"course": course, "member": member, "status": "Complete"},
+			pluck="lesson",
+		)
+	)
+
+
+def get_lesson_sequence(course):
+	"""Returns the lessons of the course flattened in reading order.
+
+	`positions` maps a lesson name and `numbers` maps a "chapter.lesson" number
+	to the position of the lesson in `lessons`, so index, url and neighbour
+	lookups don't need to walk the outline."""
+	return frappe.cache().hget("lms_lesson_sequence", course, generator=lambda: build_lesson_sequence(course))
+
+
+def build_lesson_sequence(course):
+	sequence = frappe._dict(lessons=[], positions={}, numbers={})
+
+	for chapter in get_cached_course_outline(course):
+		for lesson in chapter.lessons:
+			position = len(sequence.lessons)
+			sequence.lessons.append(
+				frappe._dict(name=lesson.name, chapter=chapter.name, number=lesson.number)
+			)
+			sequence.positions[lesson.name] = position
+			sequence.numbers[lesson.number.replace("-", ".")] = position
+
+	return sequence
+
+
+def get_lesson_at(course, chapter, lesson):
+	"""Returns the lesson at the given chapter and lesson index of the course."""
+	sequence = get_lesson_sequence(course)
+	position = sequence.numbers.get(f"{cint(chapter)}.{cint(lesson)}")
+	return None if position is None else sequence.lessons[position]
+
+
+def clear_course_outline_cache(course):
+	if course:
+		frappe.cache().hdel("lms_course_outline", course)
+		frappe.cache().hdel("lms_lesson_sequence", course)
+		frappe.cache().delete_value(f"lms_lesson_details:{course}")
+
+
 def get_lesson_icon(body, content):
 	if content:
 		content = json.loads(content)
@@ -228,11 +359,42 @@ def get_instructors(doctype, docname):
 	return instructor_details
 
 
+def get_bulk_instructors(doctype, docnames):
+	"""Returns the instructors of all the given documents in one query, keyed by document name."""
+	instructors = {docname: [] for docname in docnames}
+	if not docnames:
+		return instructors
+
+	CourseInstructor = frappe.qb.DocType("Course Instructor")
+	User = frappe.qb.DocType("User")
+
+	rows = (
+		frappe.qb.from_(CourseInstructor)
+		.join(User)
+		.on(CourseInstructor.instructor == User.name)
+		.select(
+			CourseInstructor.parent,
+			User.name,
+			User.username,
+			User.full_name,
+			User.user_image,
+			User.first_name,
+		)
+		.where(CourseInstructor.parenttype == doctype)
+		.where(CourseInstructor.parent.isin(docnames))
+		.orderby(CourseInstructor.idx)
+		.run(as_dict=True)
+	)
+
+	for row in rows:
+		instructors[row.pop("parent")].append(row)
+
+	return instructors
+
+
 def get_average_rating(course):
-	ratings = [review.rating for review in get_reviews(course)]
-	if not len(ratings):
-		return None
-	return sum(ratings) / len(ratings)
+	"""Returns the average rating maintained on the course by `update_course_rating`."""
+	return flt(frappe.db.get_value("LMS Course", course, "rating")) or None
 
 
 @frappe.whitelist(allow_guest=True)
@@ -245,10 +407,7 @@ def get_reviews(course):
 		order_by="creation desc",
 	)
 
-	out_of_ratings = frappe.db.get_all(
-		"DocField", {"parent": "LMS Course Review", "fieldtype": "Rating"}, ["options"]
-	)
-	out_of_ratings = (len(out_of_ratings) and out_of_ratings[0].options) or 5
+	out_of_ratings = get_out_of_ratings()
 	for review in reviews:
 		review.rating = review.rating * out_of_ratings
 		review.owner_details = frappe.db.get_value(
@@ -259,17 +418,27 @@ def get_reviews(course):
 	return reviews
 
 
-def get_lesson_index(lesson_name):
+def get_out_of_ratings():
+	"""Returns the number of stars of the review rating field."""
+	out_of_ratings = frappe.db.get_all(
+		"DocField", {"parent": "LMS Course Review", "fieldtype": "Rating"}, ["options"]
+	)
+	return cint((len(out_of_ratings) and out_of_ratings[0].options) or 5)
+
+
+def get_lesson_index(lesson_name, course=None):
 	"""Returns the {chapter_index}.{lesson_index} for the lesson."""
-	lesson = frappe.db.get_value("Lesson Reference", {"lesson": lesson_name}, ["idx", "parent"], as_dict=True)
-	if not lesson:
+	if not course:
+		course = frappe.db.get_value("Course Lesson", lesson_name, "course")
+	if not course:
 		return "1-1"
 
-	chapter = frappe.db.get_value("Chapter Reference", {"chapter": lesson.parent}, ["idx"], as_dict=True)
-	if not chapter:
+	sequence = get_lesson_sequence(course)
+	position = sequence.positions.get(lesson_name)
+	if position is None:
 		return "1-1"
 
-	return f"{chapter.idx}-{lesson.idx}"
+	return sequence.lessons[position].number
 
 
 def get_lesson_url(course, lesson_number):
@@ -298,6 +467,12 @@ def get_course_progress(course, member=None):
 		"LMS Course Progress",
 		{"course": course, "member": member or frappe.session.user, "status": "Complete"},
 	)
+	return get_progress_percentage(completed_lessons, lesson_count)
+
+
+def get_progress_percentage(completed_lessons, lesson_count):
+	if not lesson_count:
+		return 0
 	precision = cint(frappe.db.get_default("float_precision")) or 3
 	return flt(((completed_lessons / lesson_count) * 100), precision)
 
@@ -410,7 +585,7 @@ def create_notification_log(doc, topic):
 
 		users += instructors
 		subject = _("New reply on the topic {0} in course {1}").format(topic.title, course_title)
-		link = get_lesson_url(course, get_lesson_index(topic.reference_docname))
+		link = get_lesson_url(course, get_lesson_index(topic.reference_docname, course))
 
 	else:
 		batch_title = frappe.db.get_value("LMS Batch", topic.reference_docname, "title")
@@ -445,7 +620,7 @@ def notify_mentions_on_portal(doc, topic):
 	if topic.reference_doctype == "Course Lesson":
 		course = frappe.db.get_value("Course Lesson", topic.reference_docname, "course")
 		subject = _("{0} mentioned you in a comment in {1}").format(from_user_name, topic.title)
-		link = get_lesson_url(course, get_lesson_index(topic.reference_docname))
+		link = get_lesson_url(course, get_lesson_index(topic.reference_docname, course))
 	else:
 		batch_title = frappe.db.get_value("LMS Batch", topic.reference_docname, "title")
 		subject = _("{0} mentioned you in a comment in {1}").format(from_user_name, batch_title)
@@ -494,7 +669,7 @@ def notify_mentions_via_email(doc, topic):
 		link = f"/batches/{topic.reference_docname}#discussions"
 	if topic.reference_doctype == "Course Lesson":
 		course = frappe.db.get_value("Course Lesson", topic.reference_docname, "course")
-		lesson_index = get_lesson_index(topic.reference_docname)
+		lesson_index = get_lesson_index(topic.reference_docname, course)
 		link = get_lesson_url(course, lesson_index)
 
 	args = {
@@ -515,12 +690,90 @@ def notify_mentions_via_email(doc, topic):
 
 
 def get_lesson_count(course):
-	lesson_count = 0
-	chapters = frappe.get_all("Chapter Reference", {"parent": course}, ["chapter"])
-	for chapter in chapters:
-		lesson_count += frappe.db.count("Lesson Reference", {"parent": chapter.chapter})
+	"""Returns the lesson count maintained on the course."""
+	return cint(frappe.db.get_value("LMS Course", course, "lessons"))
+
+
+def update_course_counter(course, field, delta):
+	"""Atomically adds delta to the lessons or enrollments counter of the course."""
+	if not course:
+		return
+
+	Course = frappe.qb.DocType("LMS Course")
+	frappe.qb.update(Course).set(Course[field], Course[field] + delta).where(Course.name == course).run()
+
+
+def update_course_rating(course):
+	"""Recomputes the average rating of the course in a single statement."""
+	frappe.db.sql(
+		"""
+		UPDATE `tabLMS Course`
+		SET rating = (
+			SELECT COALESCE(ROUND(AVG(rating) * %(out_of_ratings)s, %(precision)s), 0)
+			FROM `tabLMS Course Review`
+			WHERE course = %(course)s
+		)
+		WHERE name = %(course)s
+		""",
+		{
+			"course": course,
+			"out_of_ratings": get_out_of_ratings(),
+			"precision": cint(frappe.get_system_settings("float_precision")) or 3,
+		},
+	)
+
+
+def refresh_course_lesson_count(course):
+	"""Resets the lesson counter of the course from its outline."""
+	frappe.db.set_value("LMS Course", course, "lessons", get_lessons(course, get_details=False))
+
+
+STATISTICS_CACHE = "lms_statistics"
+STATISTICS_TTL = 15 * 60
+STATISTICS_EXPIRY = 24 * 60 * 60
+
+# The public statistics can only be computed for these charts, time grains and date spans,
+# so that guests can't fill the cache with arbitrary arguments.
+STATISTICS_CHARTS = ("New Signups", "Course Enrollments", "Certification", "Lesson Completion")
+STATISTICS_TIMEGRAINS = ("Daily", "Weekly", "Monthly", "Quarterly", "Yearly")
+STATISTICS_MAX_DAYS = 366
+
+
+def get_cached_statistics(method, **kwargs):
+	"""Returns the result of a public statistics method from redis.
+
+	Results are kept per method and arguments, each under its own key that
+	expires after STATISTICS_EXPIRY. Once older than STATISTICS_TTL the
+	cached result is still served, and a background job refreshes it, so
+	guest traffic never waits for the queries except on the very first hit.
+	"""
+	arguments = json.dumps(kwargs, sort_keys=True, default=str)
+	key = f"{STATISTICS_CACHE}:{hashlib.md5(f'{method}:{arguments}'.encode()).hexdigest()}"
+	entry = frappe.cache().get_value(key)
+
+	if not entry:
+		return refresh_statistics(method, key, kwargs)
+
+	if time_diff_in_seconds(now_datetime(), entry["timestamp"]) > STATISTICS_TTL:
+		frappe.enqueue(
+			"lms.lms.utils.refresh_statistics",
+			queue="short",
+			job_id=key,
+			deduplicate=True,
+			method=method,
+			key=key,
+			kwargs=kwargs,
+		)
+
+	return entry["value"]
+
 
-	return lesson_count
+def refresh_statistics(method, key, kwargs):
+	value = frappe.get_attr(method)(**kwargs)
+	frappe.cache().set_value(
+		key, {"value": value, "timestamp": now_datetime()}, expires_in_sec=STATISTICS_EXPIRY
+	)
+	return value
 
 
 @frappe.whitelist(allow_guest=True)
@@ -532,15 +785,28 @@ def get_chart_data(
 	from_date=None,
 	to_date=None,
 ):
-	if not from_date:
-		from_date = add_months(getdate(), -1)
-	if not to_date:
-		to_date = getdate()
+	if chart_name not in STATISTICS_CHARTS:
+		frappe.throw(_("Invalid chart {0}").format(chart_name))
+
+	if timegrain not in STATISTICS_TIMEGRAINS:
+		frappe.throw(_("Invalid time grain {0}").format(timegrain))
+
+	to_date = min(getdate(to_date), getdate())
+	from_date = getdate(from_date) if from_date else add_months(to_date, -1)
+	from_date = min(max(from_date, add_days(to_date, -STATISTICS_MAX_DAYS)), to_date)
+
+	return get_cached_statistics(
+		"lms.lms.utils.compute_chart_data",
+		chart_name=chart_name,
+		timegrain=timegrain,
+		from_date=from_date.strftime("%Y-%m-%d"),
+		to_date=to_date.strftime("%Y-%m-%d"),
+	)
 
-	from_date = get_datetime(from_date).strftime("%Y-%m-%d")
-	to_date = get_datetime(to_date)
 
-	chart = frappe.get_doc("Dashboard Chart", chart_name)
+def compute_chart_data(chart_name, timegrain, from_date, to_date):
+	to_date = get_datetime(to_date)
+	chart = frappe.get_cached_doc("Dashboard Chart", chart_name)
 	doctype = chart.document_type
 	datefield = chart.based_on
 	value_field = chart.value_based_on or "1"
@@ -574,8 +840,12 @@ def get_chart_data(
 @frappe.whitelist(allow_guest=True)
 @rate_limit(limit=500, seconds=60 * 60)
 def get_course_completion_data():
+	return get_cached_statistics("lms.lms.utils.compute_course_completion_data")
+
+
+def compute_course_completion_data():
 	all_membership = frappe.db.count("LMS Enrollment")
-	completed = frappe.db.count("LMS Enrollment", {"progress": ["like", "%100%"]})
+	completed = frappe.db.count("LMS Enrollment", {"progress": [">=", 100]})
 
 	return [
 		{"label": "Completed", "value": completed},
@@ -639,7 +909,7 @@ def get_upcoming_evals(courses=None, batch=None):
 
 
 def check_multicurrency(amount, currency, country=None, amount_usd=None):
-	settings = frappe.get_single("LMS Settings")
+	settings = frappe.get_cached_doc("LMS Settings")
 	show_usd_equivalent = settings.show_usd_equivalent
 
 	# Countries for which currency should not be converted
@@ -648,13 +918,7 @@ def check_multicurrency(amount, currency, country=None, amount_usd=None):
 
 	# Get users country
 	if not country:
-		country = frappe.db.get_value("Address", {"email_id": frappe.session.user}, "country")
-
-	if not country:
-		country = frappe.db.get_value("User", frappe.session.user, "country")
-
-	if not country:
-		country = get_country_code()
+		country = get_user_country()
 
 	# If the country is the one for which conversion is not needed then return as is
 	if not country or (exception_country and country in exception_country):
@@ -681,6 +945,19 @@ def check_multicurrency(amount, currency, country=None, amount_usd=None):
 	return rounded(amount), currency
 
 
+@request_cache
+def get_user_country():
+	country = frappe.db.get_value("Address", {"email_id": frappe.session.user}, "country")
+
+	if not country:
+		country = frappe.db.get_value("User", frappe.session.user, "country")
+
+	if not country:
+		country = get_country_code()
+
+	return country
+
+
 def apply_gst(amount, country=None):
 	gst_applied = 0
 	apply_gst = frappe.db.get_single_value("LMS Settings", "apply_gst")
@@ -695,6 +972,7 @@ def apply_gst(amount, country=None):
 	return amount, gst_applied
 
 
+@redis_cache(ttl=60 * 60)
 def get_current_exchange_rate(source, target="USD"):
 	url = f"https://api.frankfurter.app/latest?from={source}&to={target}"
 
@@ -727,14 +1005,48 @@ def get_courses(filters=None, start=0):
 	if show_featured:
 		courses = get_featured_courses(filters, or_filters, fields) + courses
 
+	return hydrate_course_cards(courses)
+
+
+def get_course_cards(courses):
+	"""Returns the details of the given course names, as get_course_details does, preserving their order."""
+	if not courses:
+		return []
+
+	details = frappe.get_all("LMS Course", {"name": ["in", courses]}, get_course_fields())
+	details = {course.name: course for course in details}
+	courses = get_enrollment_details([details[course] for course in courses if course in details])
+	instructors = get_bulk_instructors("LMS Course", [course.name for course in courses])
+
+	# Same details as get_course_details, for each course
+	for course in courses:
+		course.instructors = instructors.get(course.name, [])
+
+		if course.paid_course or course.paid_certificate:
+			course.price = fmt_money(course.course_price, 0, course.currency)
+
+		course.membership = course.get("membership")
+		if frappe.session.user == "Guest":
+			course.is_instructor = False
+
+		if course.membership and course.membership.current_lesson:
+			course.current_lesson = get_lesson_index(course.membership.current_lesson, course.name)
+
+	return courses
+
+
+def hydrate_course_cards(courses):
+	"""Fills instructors, membership and price of the courses with a constant number of queries."""
 	courses = get_enrollment_details(courses)
 	courses = get_course_card_details(courses)
 	return courses
 
 
 def get_course_card_details(courses):
+	instructors = get_bulk_instructors("LMS Course", [course.name for course in courses])
+
 	for course in courses:
-		course.instructors = get_instructors("LMS Course", course.name)
+		course.instructors = instructors.get(course.name, [])
 
 		if course.paid_course and course.published == 1:
 			course.amount, course.currency = check_multicurrency(
@@ -788,19 +1100,22 @@ def update_course_filters(filters):
 
 
 def get_enrollment_details(courses):
-	for course in courses:
-		filters = {
-			"course": course.name,
+	if not courses or frappe.session.user == "Guest":
+		return courses
+
+	memberships = frappe.get_all(
+		"LMS Enrollment",
+		{
+			"course": ["in", [course.name for course in courses]],
 			"member": frappe.session.user,
-		}
+		},
+		["name", "course", "current_lesson", "progress", "member"],
+	)
+	memberships = {membership.course: membership for membership in memberships}
 
-		if frappe.db.exists("LMS Enrollment", filters):
-			course.membership = frappe.db.get_value(
-				"LMS Enrollment",
-				filters,
-				["name", "course", "current_lesson", "progress", "member"],
-				as_dict=1,
-			)
+	for course in courses:
+		if course.name in memberships:
+			course.membership = memberships[course.name]
 
 	return courses
 
@@ -876,7 +1191,9 @@ def get_course_details(course):
 		)
 
 	if course_details.membership and course_details.membership.current_lesson:
-		course_details.current_lesson = get_lesson_index(course_details.membership.current_lesson)
+		course_details.current_lesson = get_lesson_index(
+			course_details.membership.current_lesson, course_details.name
+		)
 
 	return course_details
 
@@ -919,79 +1236,84 @@ def get_categorized_courses(courses):
 @frappe.whitelist(allow_guest=True)
 def get_course_outline(course, progress=False):
 	"""Returns the course outline."""
-	outline = []
-	chapters = frappe.get_all("Chapter Reference", {"parent": course}, ["chapter", "idx"], order_by="idx")
-	for chapter in chapters:
-		chapter_details = frappe.db.get_value(
-			"Course Chapter",
-			chapter.chapter,
-			["name", "title", "is_scorm_package", "launch_file", "scorm_package"],
-			as_dict=True,
-		)
-		chapter_details["idx"] = chapter.idx
-		chapter_details.lessons = get_lessons(course, chapter_details, progress=progress)
-
-		if chapter_details.is_scorm_package:
-			chapter_details.scorm_package = frappe.db.get_value(
-				"File",
-				chapter_details.scorm_package,
-				["file_name", "file_size", "file_url"],
-				as_dict=1,
-			)
+	outline = copy.deepcopy(get_cached_course_outline(course))
+
+	if progress:
+		completed_lessons = get_completed_lessons(course)
+		for chapter in outline:
+			for lesson in chapter.lessons:
+				lesson.is_complete = lesson.name in completed_lessons
 
-		outline.append(chapter_details)
 	return outline
 
 
 @frappe.whitelist(allow_guest=True)
 @rate_limit(limit=500, seconds=60 * 60)
 def get_lesson(course, chapter, lesson):
-	chapter_name = frappe.db.get_value("Chapter Reference", {"parent": course, "idx": chapter}, "chapter")
-	lesson_name = frappe.db.get_value("Lesson Reference", {"parent": chapter_name, "idx": lesson}, "lesson")
-	lesson_details = frappe.db.get_value(
-		"Course Lesson",
-		lesson_name,
-		["include_in_preview", "title", "is_scorm_package"],
-		as_dict=1,
-	)
+	reference = get_lesson_at(course, chapter, lesson)
+	if not reference:
+		return {}
 
+	lesson_details = get_cached_lesson_details(course, reference)
 	if not lesson_details:
 		return {}
 
 	if lesson_details.is_scorm_package:
 		return {
 			"is_scorm_package": True,
-			"chapter_name": chapter_name,
+			"chapter_name": reference.chapter,
 		}
 
 	membership = get_membership(course)
-	course_info = frappe.db.get_value(
-		"LMS Course",
-		course,
-		["title", "paid_certificate", "disable_self_learning"],
-		as_dict=1,
+	is_course_instructor = any(
+		instructor.name == frappe.session.user for instructor in lesson_details.instructors
 	)
 
 	if (
 		not lesson_details.include_in_preview
 		and not membership
 		and not has_moderator_role()
-		and not is_instructor(course)
+		and not is_course_instructor
 	):
 		return {
 			"no_preview": 1,
 			"title": lesson_details.title,
-			"course_title": course_info.title,
-			"disable_self_learning": course_info.disable_self_learning,
+			"course_title": lesson_details.course_title,
+			"disable_self_learning": lesson_details.disable_self_learning,
 		}
 
+	lesson_details = copy.deepcopy(lesson_details)
+	if frappe.session.user == "Guest":
+		lesson_details.progress = 0
+	else:
+		lesson_details.progress = get_progress(course, lesson_details.name)
+
+	lesson_details.membership = membership
+	lesson_details.videos = get_video_details(lesson_details.name)
+	return lesson_details
+
+
+def get_cached_lesson_details(course, reference):
+	"""Returns the member independent part of the `get_lesson` payload.
+
+	Entries are kept per course and cleared along with the course outline,
+	which happens whenever the lesson, its chapter or the course is saved."""
+	return frappe.cache().hget(
+		f"lms_lesson_details:{course}",
+		reference.name,
+		generator=lambda: build_lesson_details(course, reference),
+	)
+
+
+def build_lesson_details(course, reference):
 	lesson_details = frappe.db.get_value(
 		"Course Lesson",
-		lesson_name,
+		reference.name,
 		[
 			"name",
 			"title",
 			"include_in_preview",
+			"is_scorm_package",
 			"body",
 			"creation",
 			"youtube",
@@ -1006,23 +1328,25 @@ def get_lesson(course, chapter, lesson):
 		as_dict=True,
 	)
 
-	if frappe.session.user == "Guest":
-		progress = 0
-	else:
-		progress = get_progress(course, lesson_details.name)
+	if not lesson_details:
+		return None
+
+	course_info = frappe.db.get_value(
+		"LMS Course",
+		course,
+		["title", "paid_certificate", "disable_self_learning"],
+		as_dict=1,
+	)
 
-	lesson_details.chapter_title = frappe.db.get_value("Course Chapter", chapter_name, "title")
-	neighbours = get_neighbour_lesson(course, chapter, lesson)
+	lesson_details.chapter_title = frappe.db.get_value("Course Chapter", reference.chapter, "title")
+	neighbours = get_neighbour_lesson(course, *reference.number.split("-"))
 	lesson_details.next = neighbours["next"]
-	lesson_details.progress = progress
 	lesson_details.prev = neighbours["prev"]
-	lesson_details.membership = membership
 	lesson_details.icon = get_lesson_icon(lesson_details.body, lesson_details.content)
 	lesson_details.instructors = get_instructors("LMS Course", course)
 	lesson_details.course_title = course_info.title
 	lesson_details.paid_certificate = course_info.paid_certificate
 	lesson_details.disable_self_learning = course_info.disable_self_learning
-	lesson_details.videos = get_video_details(lesson_name)
 	return lesson_details
 
 
@@ -1035,36 +1359,88 @@ def get_video_details(lesson_name):
 
 
 def get_neighbour_lesson(course, chapter, lesson):
-	numbers = []
-	current = f"{chapter}.{lesson}"
-	chapters = frappe.get_all("Chapter Reference", {"parent": course}, ["idx", "chapter"])
-	for chapter in chapters:
-		lessons = frappe.get_all("Lesson Reference", {"parent": chapter.chapter}, pluck="idx")
-		for lesson in lessons:
-			numbers.append(f"{chapter.idx}.{lesson}")
+	sequence = get_lesson_sequence(course)
+	index = sequence.numbers[f"{cint(chapter)}.{cint(lesson)}"]
 
-	tuples_list = [tuple(int(x) for x in s.split(".")) for s in numbers]
-	sorted_tuples = sorted(tuples_list)
-	sorted_numbers = [".".join(str(num) for num in t) for t in sorted_tuples]
-	index = sorted_numbers.index(current)
+	def get_number(position):
+		if 0 <= position < len(sequence.lessons):
+			return sequence.lessons[position].number.replace("-", ".")
 
 	return {
-		"prev": sorted_numbers[index - 1] if index - 1 >= 0 else None,
-		"next": sorted_numbers[index + 1] if index + 1 < len(sorted_numbers) else None,
+		"prev": get_number(index - 1),
+		"next": get_number(index + 1),
 	}
 
 
 @frappe.whitelist(allow_guest=True)
 @rate_limit(limit=500, seconds=60 * 60)
 def get_batch_details(batch):
-	batch_students = frappe.get_all("LMS Batch Enrollment", {"batch": batch}, pluck="member")
+	details = get_cached_batch_details(batch)
+	if not details:
+		return
+
+	is_student = bool(
+		frappe.db.exists("LMS Batch Enrollment", {"batch": batch, "member": frappe.session.user})
+	)
+	can_manage_batch = can_create_batches()
+	if not details.published and not can_manage_batch and not is_student:
+		return
+
+	batch_details = copy.deepcopy(details)
+	batch_details.accept_enrollments = batch_details.start_date > getdate()
+
 	if (
-		not frappe.db.get_value("LMS Batch", batch, "published")
-		and not can_create_batches()
-		and frappe.session.user not in batch_students
+		not batch_details.accept_enrollments
+		and batch_details.start_date == getdate()
+		and get_time_str(batch_details.start_time) > nowtime()
 	):
-		return
+		batch_details.accept_enrollments = True
+
+	# The full student list is only needed to manage the batch
+	batch_details.is_student = is_student
+	if can_manage_batch:
+		batch_details.students = frappe.get_all("LMS Batch Enrollment", {"batch": batch}, pluck="member")
+	else:
+		batch_details.students = [frappe.session.user] if is_student else []
+
+	if batch_details.paid_batch and batch_details.start_date >= getdate():
+		batch_details.amount, batch_details.currency = check_multicurrency(
+			batch_details.amount, batch_details.currency, None, batch_details.amount_usd
+		)
+		batch_details.price = fmt_money(batch_details.amount, 0, batch_details.currency)
+
+	if batch_details.seat_count:
+		batch_details.seats_left = get_seats_left(batch_details, get_batches_with_seat_held([batch]))
+
+	return batch_details
+
+
+def get_seats_left(batch, batches_with_seat_held):
+	"""The seat held for the payment of the session user is still available to them."""
+	seats_left = batch.seat_count - batch.reserved_seats
+	return seats_left + 1 if batch.name in batches_with_seat_held else seats_left
+
+
+def get_batches_with_seat_held(batches):
+	"""Returns the batches in which the session user holds a seat for their payment."""
+	if frappe.session.user == "Guest" or not batches:
+		return set()
+
+	return set(
+		frappe.get_all(
+			"LMS Seat Hold",
+			{"batch": ["in", batches], "member": frappe.session.user, "status": "Active"},
+			pluck="batch",
+		)
+	)
+
 
+def get_cached_batch_details(batch):
+	"""Returns the member independent details of the batch from the cache."""
+	return frappe.cache().hget("lms_batch_details", batch, generator=lambda: build_batch_details(batch))
+
+
+def build_batch_details(batch):
 	batch_details = frappe.db.get_value(
 		"LMS Batch",
 		batch,
@@ -1079,6 +1455,7 @@ def get_batch_details(batch):
 			"start_time",
 			"end_time",
 			"seat_count",
+			"reserved_seats",
 			"published",
 			"amount",
 			"amount_usd",
@@ -1093,32 +1470,18 @@ def get_batch_details(batch):
 		],
 		as_dict=True,
 	)
+	if not batch_details:
+		return
 
 	batch_details.instructors = get_instructors("LMS Batch", batch)
-	batch_details.accept_enrollments = batch_details.start_date > getdate()
-
-	if (
-		not batch_details.accept_enrollments
-		and batch_details.start_date == getdate()
-		and get_time_str(batch_details.start_time) > nowtime()
-	):
-		batch_details.accept_enrollments = True
-
 	batch_details.courses = frappe.get_all(
 		"Batch Course", filters={"parent": batch}, fields=["course", "title", "evaluator"]
 	)
-	batch_details.students = batch_students
-
-	if batch_details.paid_batch and batch_details.start_date >= getdate():
-		batch_details.amount, batch_details.currency = check_multicurrency(
-			batch_details.amount, batch_details.currency, None, batch_details.amount_usd
-		)
-		batch_details.price = fmt_money(batch_details.amount, 0, batch_details.currency)
+	return batch_details
 
-	if batch_details.seat_count:
-		batch_details.seats_left = batch_details.seat_count - len(batch_details.students)
 
-	return batch_details
+def clear_batch_details_cache(batch):
+	frappe.cache().hdel("lms_batch_details", batch)
 
 
 def categorize_batches(batches):
@@ -1200,134 +1563,154 @@ def get_assessments(batch, member=None):
 		["name", "assessment_type", "assessment_name"],
 	)
 
+	details = get_assessment_details_in_bulk(assessments, [member])
 	for assessment in assessments:
-		if assessment.assessment_type == "LMS Assignment":
-			assessment = get_assignment_details(assessment, member)
-
-		elif assessment.assessment_type == "LMS Quiz":
-			assessment = get_quiz_details(assessment, member)
-
-		elif assessment.assessment_type == "LMS Programming Exercise":
-			assessment = get_exercise_details(assessment, member)
+		set_assessment_details(assessment, details, member)
 
 	return assessments
 
 
-def get_assignment_details(assessment, member):
-	assessment.title = frappe.db.get_value("LMS Assignment", assessment.assessment_name, "title")
+ASSESSMENT_SUBMISSIONS = {
+	"LMS Assignment": frappe._dict(
+		doctype="LMS Assignment Submission",
+		field="assignment",
+		fields=["name", "status", "comments"],
+		order_by="modified asc",
+	),
+	# the best attempt of a quiz counts
+	"LMS Quiz": frappe._dict(
+		doctype="LMS Quiz Submission",
+		field="quiz",
+		fields=["name", "score", "percentage"],
+		order_by="percentage asc, modified asc",
+	),
+	"LMS Programming Exercise": frappe._dict(
+		doctype="LMS Programming Exercise Submission",
+		field="exercise",
+		fields=["name", "status"],
+		order_by="modified asc",
+	),
+}
+
+
+def get_assessment_details_in_bulk(assessments, members):
+	"""Returns the titles, quiz passing percentages and the submission of
+	each member for the given assessments.
+
+	Assessments are grouped by type and each type costs one query for the
+	titles and one for the submissions of all the members.
+	"""
+	details = frappe._dict(titles={}, passing_percentage={}, submissions={})
 
-	existing_submission = frappe.db.exists(
-		{
-			"doctype": "LMS Assignment Submission",
-			"member": member,
-			"assignment": assessment.assessment_name,
-		}
-	)
-	assessment.completed = False
-	if existing_submission:
-		assessment.submission = frappe.db.get_value(
-			"LMS Assignment Submission",
-			existing_submission,
-			["name", "status", "comments"],
-			as_dict=True,
+	for assessment_type, submission in ASSESSMENT_SUBMISSIONS.items():
+		names = list(
+			{
+				a.assessment_name
+				for a in assessments
+				if a.assessment_type == assessment_type and a.assessment_name
+			}
 		)
-		assessment.completed = True
-		assessment.status = assessment.submission.status
-	else:
-		assessment.status = "Not Attempted"
-		assessment.color = "red"
+		if not names:
+			continue
 
-	assessment.edit_url = f"/assignments/{assessment.assessment_name}"
-	submission_name = existing_submission if existing_submission else "new-submission"
-	assessment.url = f"/assignment-submission/{assessment.assessment_name}/{submission_name}"
+		fields = ["name", "title"]
+		if assessment_type == "LMS Quiz":
+			fields.append("passing_percentage")
+
+		for row in frappe.get_all(assessment_type, {"name": ["in", names]}, fields):
+			details.titles[(assessment_type, row.name)] = row.title
+			if assessment_type == "LMS Quiz":
+				details.passing_percentage[row.name] = row.passing_percentage
+
+		rows = frappe.get_all(
+			submission.doctype,
+			filters={"member": ["in", members], submission.field: ["in", names]},
+			fields=["member", f"{submission.field} as assessment", *submission.fields],
+			order_by=submission.order_by,
+		)
+		# rows are ordered so that the one that counts comes last
+		for row in rows:
+			details.submissions[(row.pop("member"), assessment_type, row.pop("assessment"))] = row
 
-	return assessment
+	return details
 
 
-def get_quiz_details(assessment, member):
-	assessment_details = frappe.db.get_value(
-		"LMS Quiz", assessment.assessment_name, ["title", "passing_percentage"], as_dict=1
-	)
-	assessment.title = assessment_details.title
+def get_member_submission(details, assessment, member):
+	return details.submissions.get((member, assessment.assessment_type, assessment.assessment_name))
 
-	existing_submission = frappe.get_all(
-		"LMS Quiz Submission",
-		{
-			"member": member,
-			"quiz": assessment.assessment_name,
-		},
-		["name", "score", "percentage"],
-		order_by="percentage desc",
-	)
 
-	if len(existing_submission):
-		assessment.submission = existing_submission[0]
+def set_assessment_details(assessment, details, member):
+	assessment.title = details.titles.get((assessment.assessment_type, assessment.assessment_name))
+	submission = get_member_submission(details, assessment, member)
+	name = assessment.assessment_name
+
+	if submission:
+		assessment.submission = submission
 		assessment.completed = True
-		assessment.status = assessment.submission.percentage or assessment.submission.score
+		if assessment.assessment_type == "LMS Quiz":
+			assessment.status = submission.percentage or submission.score
+		else:
+			assessment.status = submission.status
 	else:
+		assessment.completed = False
 		assessment.status = "Not Attempted"
 		assessment.color = "red"
-		assessment.completed = False
 
-	assessment.edit_url = f"/quizzes/{assessment.assessment_name}"
-	submission_name = existing_submission[0].name if len(existing_submission) else "new-submission"
-	assessment.url = f"/quiz-submission/{assessment.assessment_name}/{submission_name}"
+	submission_name = submission.name if submission else "new-submission"
+	if assessment.assessment_type == "LMS Assignment":
+		assessment.edit_url = f"/assignments/{name}"
+		assessment.url = f"/assignment-submission/{name}/{submission_name}"
+	elif assessment.assessment_type == "LMS Quiz":
+		assessment.edit_url = f"/quizzes/{name}"
+		assessment.url = f"/quiz-submission/{name}/{submission_name}"
+	elif assessment.assessment_type == "LMS Programming Exercise":
+		assessment.edit_url = f"/exercises/{name}/submission/{submission.name if submission else 'new'}"
 
 	return assessment
 
 
+def get_assignment_details(assessment, member):
+	return get_single_assessment_details(assessment, "LMS Assignment", member)
+
+
+def get_quiz_details(assessment, member):
+	return get_single_assessment_details(assessment, "LMS Quiz", member)
+
+
 def get_exercise_details(assessment, member):
-	assessment.title = frappe.db.get_value("LMS Programming Exercise", assessment.assessment_name, "title")
-	filters = {"member": member, "exercise": assessment.assessment_name}
+	return get_single_assessment_details(assessment, "LMS Programming Exercise", member)
 
-	if frappe.db.exists("LMS Programming Exercise Submission", filters):
-		assessment.submission = frappe.db.get_value(
-			"LMS Programming Exercise Submission",
-			filters,
-			["name", "status"],
-			as_dict=True,
-		)
-		assessment.completed = True
-		assessment.status = assessment.submission.status
-		assessment.edit_url = (
-			f"/exercises/{assessment.assessment_name}/submission/{assessment.submission.name}"
-		)
-	else:
-		assessment.status = "Not Attempted"
-		assessment.color = "red"
-		assessment.completed = False
-		assessment.edit_url = f"/exercises/{assessment.assessment_name}/submission/new"
+
+def get_single_assessment_details(assessment, assessment_type, member):
+	assessment.assessment_type = assessment_type
+	details = get_assessment_details_in_bulk([assessment], [member])
+	return set_assessment_details(assessment, details, member)
 
 
 @frappe.whitelist()
-def get_batch_students(batch):
-	students = []
-	students_list = frappe.get_all(
-		"LMS Batch Enrollment", filters={"batch": batch}, fields=["member", "name"]
-	)
+def get_batch_students(batch, start=0, page_length=None, sort_order="desc"):
+	"""Returns the students of the batch with their course and assessment
+	progress, sorted by overall progress and optionally paged."""
+	students = get_batch_progress_matrix(batch)
+	students.sort(key=lambda student: student.progress, reverse=sort_order != "asc")
 
-	for student in students_list:
-		details = get_batch_student_details(student)
-		calculate_student_progress(batch, details)
-		students.append(details)
-		students = sorted(students, key=lambda x: x.progress, reverse=True)
-	return students
+	start = cint(start)
+	if cint(page_length):
+		return students[start : start + cint(page_length)]
+	return students[start:]
 
 
-def get_batch_student_details(student):
-	details = frappe.db.get_value(
-		"User",
-		student.member,
-		["full_name", "email", "username", "last_active", "user_image"],
-		as_dict=True,
-	)
-	details.last_active = format_datetime(details.last_active, "dd MMM YY")
-	details.name = student.name
-	details.assessments = frappe._dict()
-	return details
+def get_batch_progress_matrix(batch):
+	"""Builds the student x course/assessment progress matrix of the batch.
 
+	Students, course progress and submissions of all students are loaded
+	with a handful of set queries, independent of the size of the batch.
+	"""
+	students = get_batch_student_details(batch)
+	if not students:
+		return []
 
-def calculate_student_progress(batch, details):
+	members = [student.member for student in students]
 	batch_courses = frappe.get_all("Batch Course", {"parent": batch}, ["course", "title"])
 	assessments = frappe.get_all(
 		"LMS Assessment",
@@ -1335,47 +1718,85 @@ def calculate_student_progress(batch, details):
 		fields=["name", "assessment_type", "assessment_name"],
 	)
 
-	calculate_course_progress(batch_courses, details)
-	calculate_assessment_progress(assessments, details)
-
-	if len(batch_courses) + len(assessments):
-		details.progress = flt(
-			(
-				(details.average_course_progress * len(batch_courses))
-				+ (details.average_assessments_progress * len(assessments))
+	course_progress = get_members_course_progress(members, [course.course for course in batch_courses])
+	assessment_details = get_assessment_details_in_bulk(assessments, members)
+
+	for student in students:
+		calculate_course_progress(batch_courses, student, course_progress)
+		calculate_assessment_progress(assessments, student, assessment_details)
+
+		if len(batch_courses) + len(assessments):
+			student.progress = flt(
+				(
+					(student.average_course_progress * len(batch_courses))
+					+ (student.average_assessments_progress * len(assessments))
+				)
+				/ (len(batch_courses) + len(assessments)),
+				2,
 			)
-			/ (len(batch_courses) + len(assessments)),
-			2,
+		else:
+			student.progress = 0
+
+	return students
+
+
+def get_batch_student_details(batch):
+	BatchEnrollment = frappe.qb.DocType("LMS Batch Enrollment")
+	User = frappe.qb.DocType("User")
+
+	students = (
+		frappe.qb.from_(BatchEnrollment)
+		.join(User)
+		.on(User.name == BatchEnrollment.member)
+		.select(
+			BatchEnrollment.name,
+			BatchEnrollment.member,
+			User.full_name,
+			User.email,
+			User.username,
+			User.last_active,
+			User.user_image,
 		)
-	else:
-		details.progress = 0
+		.where(BatchEnrollment.batch == batch)
+		.run(as_dict=True)
+	)
+
+	for student in students:
+		student.last_active = format_datetime(student.last_active, "dd MMM YY")
+	return students
+
+
+def get_members_course_progress(members, courses):
+	if not courses:
+		return {}
+
+	enrollments = frappe.get_all(
+		"LMS Enrollment",
+		filters={"member": ["in", members], "course": ["in", courses]},
+		fields=["member", "course", "progress"],
+	)
+	return {(enrollment.member, enrollment.course): enrollment.progress for enrollment in enrollments}
 
 
-def calculate_course_progress(batch_courses, details):
-	course_progress = []
+def calculate_course_progress(batch_courses, details, course_progress):
+	progress = []
 	details.courses = frappe._dict()
 
 	for course in batch_courses:
-		progress = frappe.db.get_value(
-			"LMS Enrollment", {"course": course.course, "member": details.email}, "progress"
-		)
-		details.courses[course.title] = progress
-		course_progress.append(progress)
+		value = course_progress.get((details.member, course.course))
+		details.courses[course.title] = value
+		progress.append(flt(value))
 
-	details.average_course_progress = (
-		flt(sum(course_progress) / len(batch_courses), 2) if len(batch_courses) else 0
-	)
+	details.average_course_progress = flt(sum(progress) / len(batch_courses), 2) if len(batch_courses) else 0
 
 
-def calculate_assessment_progress(assessments, details):
+def calculate_assessment_progress(assessments, details, assessment_details):
 	assessments_completed = 0
 	details.assessments = frappe._dict()
 
 	for assessment in assessments:
-		title = frappe.db.get_value(assessment.assessment_type, assessment.assessment_name, "title")
-		assessment_info = has_submitted_assessment(
-			assessment.assessment_name, assessment.assessment_type, details.email
-		)
+		title = assessment_details.titles.get((assessment.assessment_type, assessment.assessment_name))
+		assessment_info = get_assessment_result(assessment, assessment_details, details.member)
 		details.assessments[title] = assessment_info
 
 		if assessment_info.result == "Pass":
@@ -1386,59 +1807,36 @@ def calculate_assessment_progress(assessments, details):
 	)
 
 
+def get_assessment_result(assessment, assessment_details, member):
+	"""Returns the status and result of the member's submission for the assessment."""
+	is_quiz = assessment.assessment_type == "LMS Quiz"
+	submission = get_member_submission(assessment_details, assessment, member)
+	if not submission:
+		return frappe._dict({"status": 0 if is_quiz else "Not Attempted", "result": "Failed"})
+
+	if is_quiz:
+		passing_percentage = assessment_details.passing_percentage.get(assessment.assessment_name)
+		result = "Pass" if flt(submission.percentage) >= flt(passing_percentage) else "Failed"
+	else:
+		result = submission.status
+
+	return frappe._dict(
+		{
+			"status": submission.percentage if is_quiz else submission.status,
+			"result": result,
+			"assessment": assessment.assessment_name,
+			"type": assessment.assessment_type,
+			"submission": submission.name,
+		}
+	)
+
+
 def has_submitted_assessment(assessment, assessment_type, member=None):
 	if not member:
 		member = frappe.session.user
 
-	if assessment_type == "LMS Assignment":
-		doctype = "LMS Assignment Submission"
-		docfield = "assignment"
-		fields = ["status"]
-		not_attempted = "Not Attempted"
-	elif assessment_type == "LMS Quiz":
-		doctype = "LMS Quiz Submission"
-		docfield = "quiz"
-		fields = ["percentage"]
-		not_attempted = 0
-	elif assessment_type == "LMS Programming Exercise":
-		doctype = "LMS Programming Exercise Submission"
-		docfield = "exercise"
-		fields = ["status"]
-		not_attempted = "Not Attempted"
-
-	filters = {}
-	filters[docfield] = assessment
-	filters["member"] = member
-
-	attempt = frappe.db.exists(doctype, filters)
-	if attempt:
-		fields.append("name")
-		attempt_details = frappe.db.get_value(doctype, filters, fields, as_dict=1)
-		if assessment_type == "LMS Quiz":
-			result = "Failed"
-			passing_percentage = frappe.db.get_value("LMS Quiz", assessment, "passing_percentage")
-			if attempt_details.percentage >= passing_percentage:
-				result = "Pass"
-		else:
-			result = attempt_details.status
-		return frappe._dict(
-			{
-				"status": attempt_details.percentage
-				if assessment_type == "LMS Quiz"
-				else attempt_details.status,
-				"result": result,
-				"assessment": assessment,
-				"type": assessment_type,
-				"submission": attempt_details.name,
-			}
-		)
-	else:
-		return frappe._dict(
-			{
-				"status": not_attempted,
-				"result": "Failed",
-			}
-		)
+	assessment = frappe._dict({"assessment_name": assessment, "assessment_type": assessment_type})
+	return get_assessment_result(assessment, get_assessment_details_in_bulk([assessment], [member]), member)
 
 
 @frappe.whitelist()
@@ -1637,7 +2035,8 @@ def calculate_discount_amount(base_amount, coupon):
 @frappe.whitelist()
 def get_lesson_creation_details(course, chapter, lesson):
 	chapter_name = frappe.db.get_value("Chapter Reference", {"parent": course, "idx": chapter}, "chapter")
-	lesson_name = frappe.db.get_value("Lesson Reference", {"parent": chapter_name, "idx": lesson}, "lesson")
+	reference = get_lesson_at(course, chapter, lesson)
+	lesson_name = reference.name if reference else None
 
 	if lesson_name:
 		lesson_details = frappe.db.get_value(
@@ -1679,6 +2078,97 @@ def publish_notifications(doc, method):
 	frappe.publish_realtime("publish_lms_notifications", user=doc.for_user, after_commit=True)
 
 
+PROGRESS_EVENTS = "lms_progress_events"
+PROGRESS_EVENTS_SENT = "lms_progress_events_sent"
+PROGRESS_EVENT_INTERVAL = 5
+
+
+def publish_progress_update(member, course, lesson, progress):
+	"""Queues an `update_lesson_progress` event for the member.
+
+	Events are collected in redis, so that rapid successive updates of a member
+	in a course go out as one message with the latest progress. The first update
+	after PROGRESS_EVENT_INTERVAL seconds queues `send_progress_events` right away,
+	the updates made within the interval are sent by the next one or by the
+	scheduler.
+	"""
+	cache = frappe.cache()
+	cache.hset(
+		PROGRESS_EVENTS,
+		f"{member}::{course}",
+		{"member": member, "course": course, "lesson": lesson, "progress": progress},
+	)
+
+	if cache.set(cache.make_key(PROGRESS_EVENTS_SENT), 1, nx=True, ex=PROGRESS_EVENT_INTERVAL):
+		frappe.enqueue(
+			"lms.lms.utils.send_progress_events",
+			queue="short",
+			job_id=PROGRESS_EVENTS,
+			deduplicate=True,
+			enqueue_after_commit=True,
+		)
+
+
+def send_progress_events():
+	"""Sends the queued progress events to the members' own rooms and one
+	`batch_progress_changed` event to each batch with changed learners.
+	Also runs on the scheduler to send the events of the last interval."""
+	cache = frappe.cache()
+	if not cache.exists(PROGRESS_EVENTS):
+		return
+
+	# Swap the events out to a key of this run, so that a run queued by an update
+	# and the scheduled run never send or drop the events of each other.
+	sending = f"{PROGRESS_EVENTS}_sending_{frappe.generate_hash(length=10)}"
+	try:
+		cache.rename(cache.make_key(PROGRESS_EVENTS), cache.make_key(sending))
+	except ResponseError:
+		# The other run took the events since the check above
+		return
+
+	events = list(cache.hgetall(sending).values())
+	cache.delete_value(sending)
+
+	for event in events:
+		frappe.publish_realtime(
+			"update_lesson_progress",
+			{"course": event["course"], "lesson": event["lesson"], "progress": event["progress"]},
+			user=event["member"],
+		)
+
+	for batch, members in get_batches_with_progress_events(events).items():
+		frappe.publish_realtime(
+			"batch_progress_changed",
+			{"batch": batch, "members": sorted(members)},
+			doctype="LMS Batch",
+			docname=batch,
+		)
+
+
+def get_batches_with_progress_events(events):
+	BatchEnrollment = frappe.qb.DocType("LMS Batch Enrollment")
+	BatchCourse = frappe.qb.DocType("Batch Course")
+	changed = {(event["member"], event["course"]) for event in events}
+
+	rows = (
+		frappe.qb.from_(BatchEnrollment)
+		.join(BatchCourse)
+		.on((BatchCourse.parent == BatchEnrollment.batch) & (BatchCourse.parenttype == "LMS Batch"))
+		.select(BatchEnrollment.batch, BatchEnrollment.member, BatchCourse.course)
+		.where(
+			BatchEnrollment.member.isin([member for member, course in changed])
+			& BatchCourse.course.isin([course for member, course in changed])
+		)
+		.run(as_dict=True)
+	)
+
+	batches = {}
+	for row in rows:
+		if (row.member, row.course) in changed:
+			batches.setdefault(row.batch, set()).add(row.member)
+	return batches
+
+
 def update_payment_record(doctype, docname):
 	request = get_integration_requests(doctype, docname)
 
@@ -1776,7 +2266,7 @@ def enroll_in_batch(batch, payment_name=None):
 		frappe.throw(_("The specified batch does not exist."))
 
 	batch_doc = frappe.db.get_value(
-		"LMS Batch", batch, ["name", "seat_count", "allow_self_enrollment", "paid_batch"], as_dict=True
+		"LMS Batch", batch, ["name", "allow_self_enrollment", "paid_batch"], as_dict=True
 	)
 	payment_doc = get_payment_details(payment_name)
 	validate_enrollment_eligibility(batch_doc, payment_doc)
@@ -1803,10 +2293,6 @@ def validate_enrollment_eligibility(batch_doc, payment_doc=None):
 	elif not batch_doc.allow_self_enrollment:
 		frappe.throw(_("Enrollment in this batch is restricted. Please contact the Administrator."))
 
-	students = frappe.db.count("LMS Batch Enrollment", {"batch": batch_doc.name})
-	if batch_doc.seat_count and students >= batch_doc.seat_count:
-		frappe.throw(_("There are no seats available in this batch."))
-
 
 def create_enrollment(batch, payment_doc=None):
 	new_student = frappe.new_doc("LMS Batch Enrollment")
@@ -1958,6 +2444,7 @@ def get_batches(filters=None, start=0, order_by="start_date"):
 			"title",
 			"description",
 			"seat_count",
+			"reserved_seats",
 			"paid_batch",
 			"amount",
 			"amount_usd",
@@ -1970,33 +2457,25 @@ def get_batches(filters=None, start=0, order_by="start_date"):
 			"published",
 			"category",
 		],
+		or_filters=get_start_time_filters(filters),
 		order_by=order_by,
 		start=start,
 		page_length=20,
 	)
 
-	batches = filter_batches_based_on_start_time(batches, filters)
 	batches = get_batch_card_details(batches)
 	return batches
 
 
-def filter_batches_based_on_start_time(batches, filters):
+def get_start_time_filters(filters):
+	"""Batches starting today are upcoming until their start time and archived after it.
+	Returns the filters that enforce this in the query, so that pages stay full."""
 	batchType = get_batch_type(filters)
 	if batchType == "upcoming":
-		batches_to_remove = [
-			batch
-			for batch in batches
-			if getdate(batch.start_date) == getdate() and get_time_str(batch.start_time) < nowtime()
-		]
-		batches = [batch for batch in batches if batch not in batches_to_remove]
+		return [["start_date", "!=", getdate()], ["start_time", ">=", nowtime()]]
 	elif batchType == "archived":
-		batches_to_remove = [
-			batch
-			for batch in batches
-			if getdate(batch.start_date) == getdate() and get_time_str(batch.start_time) >= nowtime()
-		]
-		batches = [batch for batch in batches if batch not in batches_to_remove]
-	return batches
+		return [["start_date", "!=", getdate()], ["start_time", "<", nowtime()]]
+	return None
 
 
 def get_batch_type(filters):
@@ -2013,12 +2492,15 @@ def get_batch_type(filters):
 
 
 def get_batch_card_details(batches):
+	batch_names = [batch.name for batch in batches]
+	instructors = get_bulk_instructors("LMS Batch", batch_names)
+	batches_with_seat_held = get_batches_with_seat_held(batch_names)
+
 	for batch in batches:
-		batch.instructors = get_instructors("LMS Batch", batch.name)
-		students_count = frappe.db.count("LMS Batch Enrollment", {"batch": batch.name})
+		batch.instructors = instructors.get(batch.name, [])
 
 		if batch.seat_count:
-			batch.seats_left = batch.seat_count - students_count
+			batch.seats_left = get_seats_left(batch, batches_with_seat_held)
 
 		if batch.paid_batch and batch.start_date >= getdate():
 			batch.amount, batch.currency = check_multicurrency(
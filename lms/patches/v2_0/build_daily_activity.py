@@ -0,0 +1,5 @@
+from lms.lms.doctype.lms_daily_activity.lms_daily_activity import rebuild_daily_activity
+
+
+def execute():
+	rebuild_daily_activity()
@@ -0,0 +1,5 @@
+from lms.lms.doctype.lms_streak.lms_streak import rebuild_streaks
+
+
+def execute():
+	rebuild_streaks()
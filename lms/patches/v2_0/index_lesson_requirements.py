@@ -0,0 +1,15 @@
+import frappe
+
+
+def execute():
+	lessons = frappe.get_all(
+		"Course Lesson",
+		or_filters={"content": ["is", "set"], "body": ["is", "set"]},
+		pluck="name",
+	)
+
+	for lesson in lessons:
+		doc = frappe.get_doc("Course Lesson", lesson)
+		doc.set_requirements()
+		for row in doc.requirements:
+			row.db_insert()
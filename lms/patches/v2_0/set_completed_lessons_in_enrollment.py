@@ -0,0 +1,31 @@
+import frappe
+from frappe.query_builder.functions import Count
+
+
+def execute():
+	Progress = frappe.qb.DocType("LMS Course Progress")
+	Enrollment = frappe.qb.DocType("LMS Enrollment")
+	LessonReference = frappe.qb.DocType("Lesson Reference")
+	Chapter = frappe.qb.DocType("Course Chapter")
+
+	# Only the lessons still in the outline of the course are counted, like the lesson count
+	rows = (
+		frappe.qb.from_(Enrollment)
+		.join(Progress)
+		.on((Progress.course == Enrollment.course) & (Progress.member == Enrollment.member))
+		.join(LessonReference)
+		.on(LessonReference.lesson == Progress.lesson)
+		.join(Chapter)
+		.on((Chapter.name == LessonReference.parent) & (Chapter.course == Enrollment.course))
+		.select(Enrollment.name, Count(Progress.lesson).distinct().as_("completed_lessons"))
+		.where(Progress.status == "Complete")
+		.groupby(Enrollment.name)
+		.run(as_dict=True)
+	)
+
+	if rows:
+		frappe.db.bulk_update(
+			"LMS Enrollment",
+			{row.name: {"completed_lessons": row.completed_lessons} for row in rows},
+			update_modified=False,
+		)
@@ -0,0 +1,5 @@
+from lms.lms.doctype.lms_seat_hold.lms_seat_hold import reconcile_reserved_seats
+
+
+def execute():
+	reconcile_reserved_seats()
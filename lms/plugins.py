@@ -18,6 +18,7 @@ from urllib.parse import quote
 
 import frappe
 from frappe import _
+from frappe.query_builder.functions import Count
 
 
 class PageExtension:
@@ -92,16 +93,31 @@ class LiveCodeExtension(PageExtension):
 		return frappe.render_template("templates/livecode/extension_footer.html", context)
 
 
-def quiz_renderer(quiz_name):
+def quiz_renderer(quiz_name, context=None):
 	if frappe.session.user == "Guest":
 		return " <div class='alert alert-info'>" + _(
 			"Quiz is not available to Guest users. Please login to continue."
 		)
 		+"</div>"
 
-	quiz = frappe.db.get_value(
+	if not context:
+		context = prefetch_quizzes([quiz_name]).get(quiz_name)
+
+	return frappe.render_template("templates/quiz/quiz.html", context)
+
+
+def prefetch_quizzes(quiz_names):
+	"""Loads the given quizzes with their questions and the attempts of the
+	session user in a fixed number of queries.
+
+	Returns a dictionary mapping the quiz name to the context of the quiz template.
+	"""
+	if frappe.session.user == "Guest" or not quiz_names:
+		return {}
+
+	quizzes = frappe.get_all(
 		"LMS Quiz",
-		quiz_name,
+		{"name": ["in", quiz_names]},
 		[
 			"name",
 			"title",
@@ -110,9 +126,38 @@ def quiz_renderer(quiz_name):
 			"show_submission_history",
 			"passing_percentage",
 		],
-		as_dict=True,
 	)
-	quiz.questions = []
+
+	questions = get_quiz_questions(quiz_names)
+	attempts = get_quiz_attempts(quiz_names)
+	submissions = {}
+	history = [quiz.name for quiz in quizzes if quiz.show_submission_history]
+	if history:
+		for submission in frappe.get_all(
+			"LMS Quiz Submission",
+			{"quiz": ["in", history], "member": frappe.session.user},
+			["name", "score", "creation", "quiz"],
+			order_by="creation desc",
+		):
+			submissions.setdefault(submission.pop("quiz"), []).append(submission)
+
+	context = {}
+	for quiz in quizzes:
+		quiz.questions = questions.get(quiz.name, [])
+		context[quiz.name] = {
+			"quiz": quiz,
+			"no_of_attempts": attempts.get(quiz.name, 0),
+			"all_submissions": submissions.get(quiz.name, []) if quiz.show_submission_history else None,
+			"hide_quiz": False,
+		}
+
+	return context
+
+
+def get_quiz_questions(quiz_names):
+	QuizQuestion = frappe.qb.DocType("LMS Quiz Question")
+	Question = frappe.qb.DocType("LMS Question")
+
 	fields = ["name", "question", "type", "multiple"]
 	for num in range(1, 5):
 		fields.append(f"option_{num}")
@@ -120,40 +165,34 @@ def quiz_renderer(quiz_name):
 		fields.append(f"explanation_{num}")
 		fields.append(f"possibility_{num}")
 
-	questions = frappe.get_all(
-		"LMS Quiz Question",
-		filters={"parent": quiz.name},
-		fields=["question", "marks"],
-		order_by="idx",
+	rows = (
+		frappe.qb.from_(QuizQuestion)
+		.join(Question)
+		.on(QuizQuestion.question == Question.name)
+		.select(QuizQuestion.parent.as_("quiz"), QuizQuestion.marks, *[Question[field] for field in fields])
+		.where(QuizQuestion.parent.isin(quiz_names))
+		.orderby(QuizQuestion.idx)
+		.run(as_dict=True)
 	)
 
-	for question in questions:
-		details = frappe.db.get_value("LMS Question", question.question, fields, as_dict=1)
-		details["marks"] = question.marks
-		quiz.questions.append(details)
+	questions = {}
+	for row in rows:
+		questions.setdefault(row.pop("quiz"), []).append(row)
+	return questions
 
-	no_of_attempts = frappe.db.count("LMS Quiz Submission", {"owner": frappe.session.user, "quiz": quiz_name})
 
-	if quiz.show_submission_history:
-		all_submissions = frappe.get_all(
-			"LMS Quiz Submission",
-			{
-				"quiz": quiz.name,
-				"member": frappe.session.user,
-			},
-			["name", "score", "creation"],
-			order_by="creation desc",
-		)
+def get_quiz_attempts(quiz_names):
+	Submission = frappe.qb.DocType("LMS Quiz Submission")
 
-	return frappe.render_template(
-		"templates/quiz/quiz.html",
-		{
-			"quiz": quiz,
-			"no_of_attempts": no_of_attempts,
-			"all_submissions": all_submissions if quiz.show_submission_history else None,
-			"hide_quiz": False,
-		},
+	rows = (
+		frappe.qb.from_(Submission)
+		.select(Submission.quiz, Count(Submission.name).as_("attempts"))
+		.where(Submission.owner == frappe.session.user)
+		.where(Submission.quiz.isin(quiz_names))
+		.groupby(Submission.quiz)
+		.run(as_dict=True)
 	)
+	return {row.quiz: row.attempts for row in rows}
 
 
 def exercise_renderer(argument):